@@ -0,0 +1,9 @@
+import pytest
+
+from core.testing import temporary_files
+
+
+@pytest.fixture(autouse=True, scope='session')
+def temporary_locations():
+    with temporary_files():
+        yield
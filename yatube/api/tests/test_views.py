@@ -0,0 +1,101 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Comment, Follow, Group, Post, User
+
+from yatube.settings import QUANTITY
+
+USER_NAME = 'auth'
+USER_NAME_2 = 'man'
+SLUG = 'test_slug'
+INDEX = reverse('api:index')
+GROUP = reverse('api:group', args=[SLUG])
+PROFILE = reverse('api:profile', args=[USER_NAME])
+FOLLOW = reverse('api:follow_index')
+
+
+class ApiViewsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(
+            USER_NAME, first_name='Лев', last_name='Толстой'
+        )
+        cls.reader = User.objects.create_user(USER_NAME_2)
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug=SLUG, description='Описание'
+        )
+        Post.objects.bulk_create(
+            Post(author=cls.author, group=cls.group, text=f'Пост {number}')
+            for number in range(QUANTITY + 3)
+        )
+        cls.post = Post.objects.order_by('pk').last()
+        Comment.objects.create(
+            post=cls.post, author=cls.reader, text='Комментарий'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        cls.detail = reverse('api:post_detail', args=[cls.post.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_feeds_paginate_with_cursor(self):
+        for address in (INDEX, GROUP, PROFILE):
+            with self.subTest(address=address):
+                data = self.client.get(address).json()
+                self.assertEqual(len(data['results']), QUANTITY)
+                self.assertIsNone(data['previous'])
+                first = data['results'][0]
+                self.assertEqual(first['author'], {
+                    'username': USER_NAME, 'full_name': 'Лев Толстой'
+                })
+                self.assertEqual(first['group']['slug'], SLUG)
+                data = self.client.get(data['next']).json()
+                self.assertEqual(len(data['results']), 3)
+                self.assertIsNone(data['next'])
+
+    def test_post_detail_includes_comments(self):
+        data = self.client.get(self.detail).json()
+        self.assertEqual(data['id'], self.post.pk)
+        self.assertEqual(data['comments'][0]['author'], USER_NAME_2)
+        self.assertEqual(
+            self.client.get(
+                reverse('api:post_detail', args=[0])
+            ).status_code,
+            404,
+        )
+
+    def test_conditional_get(self):
+        response = self.client.get(INDEX)
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                INDEX, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(response.status_code, 304)
+        etag = response['ETag']
+        Post.objects.create(author=self.author, text='Новый пост')
+        response = self.client.get(INDEX, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['text'], 'Новый пост')
+
+    def test_post_detail_revalidates_without_queries(self):
+        etag = self.client.get(self.detail)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_follow_feed(self):
+        self.assertEqual(self.client.get(FOLLOW).status_code, 401)
+        data = self.reader_client.get(FOLLOW).json()
+        self.assertEqual(len(data['results']), QUANTITY)
+        etag = self.reader_client.get(FOLLOW)['ETag']
+        Follow.objects.all().delete()
+        response = self.reader_client.get(FOLLOW, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()['results'], [])
+
+    def test_read_only(self):
+        self.assertEqual(self.client.post(INDEX).status_code, 405)
@@ -0,0 +1,140 @@
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from core.cache import condition_versioned
+from core.pagination import KeysetPaginator
+from core.routers import replica_reads
+from posts.models import Comment, Group, Post, User
+from posts.timeline import timeline_posts
+from posts.views import detail_scopes
+
+from yatube.settings import COMMENTS_QUANTITY, QUANTITY
+
+POST_FIELDS = (
+    "id",
+    "text",
+    "pub_date",
+    "image",
+    "author",
+    "group",
+    "author__username",
+    "author__first_name",
+    "author__last_name",
+    "group__slug",
+    "group__title",
+    "comment_count",
+)
+
+
+def serialize_post(post):
+    return {
+        "id": post.pk,
+        "text": post.text,
+        "pub_date": post.pub_date.isoformat(),
+        "image": post.image.url if post.image else None,
+        "author": {
+            "username": post.author.username,
+            "full_name": post.author.get_full_name(),
+        },
+        "group": {
+            "slug": post.group.slug,
+            "title": post.group.title,
+        } if post.group_id else None,
+    }
+
+
+def page_url(request, cursor):
+    if cursor is None:
+        return None
+    return request.build_absolute_uri(f"{request.path}?cursor={cursor}")
+
+
+def feed_response(request, posts):
+    posts = posts.select_related("author", "group").only(*POST_FIELDS)
+    page = KeysetPaginator(posts, QUANTITY).get_page(
+        cursor=request.GET.get("cursor")
+    )
+    return JsonResponse({
+        "results": [serialize_post(post) for post in page],
+        "next": page_url(request, page.next_cursor),
+        "previous": page_url(request, page.previous_cursor),
+    }, json_dumps_params={"ensure_ascii": False})
+
+
+@require_safe
+@condition_versioned(lambda request: [("groups",), ("posts",)])
+@replica_reads
+def index(request):
+    return feed_response(request, Post.objects.all())
+
+
+@require_safe
+@condition_versioned(
+    lambda request, any_slug: [("groups",), ("group", any_slug)]
+)
+@replica_reads
+def group_posts(request, any_slug):
+    group = get_object_or_404(Group.objects.only("pk"), slug=any_slug)
+    return feed_response(request, Post.objects.filter(group=group))
+
+
+@require_safe
+@condition_versioned(
+    lambda request, username: [("groups",), ("profile", username)]
+)
+@replica_reads
+def profile(request, username):
+    author = get_object_or_404(User.objects.only("pk"), username=username)
+    return feed_response(request, Post.objects.filter(author=author))
+
+
+@require_safe
+@condition_versioned(detail_scopes)
+@replica_reads
+def post_detail(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related("author", "group").only(*POST_FIELDS),
+        pk=post_id,
+    )
+    comments = Comment.objects.filter(post=post).select_related(
+        "author"
+    ).only("id", "text", "pub_date", "author", "author__username")
+    page = KeysetPaginator(comments, COMMENTS_QUANTITY).get_page()
+    data = serialize_post(post)
+    data["comment_count"] = post.comment_count
+    data["comments"] = [
+        {
+            "id": comment.pk,
+            "text": comment.text,
+            "pub_date": comment.pub_date.isoformat(),
+            "author": comment.author.username,
+        }
+        for comment in page
+    ]
+    data["comments_next"] = None
+    if page.next_cursor:
+        data["comments_next"] = request.build_absolute_uri(
+            reverse("posts:post_comments", args=[post.pk])
+            + f"?format=json&cursor={page.next_cursor}"
+        )
+    return JsonResponse(data, json_dumps_params={"ensure_ascii": False})
+
+
+def follow_scopes(request):
+    return [("groups",), ("posts",), ("follows", request.user.pk)]
+
+
+@require_safe
+def follow_index(request):
+    if not request.user.is_authenticated:
+        return JsonResponse(
+            {"detail": "Требуется авторизация"}, status=401
+        )
+    return condition_versioned(follow_scopes)(followed_posts)(request)
+
+
+@replica_reads
+def followed_posts(request):
+    return feed_response(request, timeline_posts(request.user))
@@ -0,0 +1,101 @@
+import random
+from itertools import accumulate
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import transaction
+from faker import Faker
+
+from posts.models import Comment, Follow, Group, Post, User
+
+PASSWORD = "benchmark"
+
+
+class ZipfChooser:
+    """Picks items with probability proportional to 1 / rank ** skew."""
+
+    def __init__(self, items, skew, rng):
+        self.items = list(items)
+        self.rng = rng
+        self.weights = list(accumulate(
+            1 / rank ** skew for rank in range(1, len(self.items) + 1)
+        ))
+
+    def choice(self):
+        return self.rng.choices(self.items, cum_weights=self.weights)[0]
+
+
+def generate(users, groups, posts, comments, follows, skew=1.1, seed=0,
+             stdout=None):
+    rng = random.Random(seed)
+    fake = Faker("ru_RU")
+    fake.seed_instance(seed)
+    with transaction.atomic():
+        password = make_password(PASSWORD)
+        User.objects.bulk_create(
+            [
+                User(
+                    username=f"bench_{i}",
+                    first_name=fake.first_name(),
+                    last_name=fake.last_name(),
+                    password=password,
+                )
+                for i in range(users)
+            ]
+        )
+        user_ids = list(User.objects.filter(
+            username__startswith="bench_"
+        ).values_list("pk", flat=True))
+        Group.objects.bulk_create([
+            Group(
+                title=fake.sentence(nb_words=2)[:200],
+                slug=f"bench-{i}",
+                description=fake.paragraph(),
+            )
+            for i in range(groups)
+        ])
+        group_ids = list(Group.objects.filter(
+            slug__startswith="bench-"
+        ).values_list("pk", flat=True)) + [None]
+
+        authors = ZipfChooser(user_ids, skew, rng)
+        Post.objects.bulk_create(
+            (
+                Post(
+                    author_id=authors.choice(),
+                    group_id=rng.choice(group_ids),
+                    text=fake.paragraph(nb_sentences=rng.randint(1, 6)),
+                )
+                for _ in range(posts)
+            )
+        )
+        post_ids = list(Post.objects.order_by("-pk").values_list(
+            "pk", flat=True
+        )[:posts])
+        popular_posts = ZipfChooser(post_ids, skew, rng)
+        Comment.objects.bulk_create(
+            (
+                Comment(
+                    author_id=rng.choice(user_ids),
+                    post_id=popular_posts.choice(),
+                    text=fake.sentence(),
+                )
+                for _ in range(comments)
+            )
+        )
+        pairs = set()
+        for _ in range(follows * 3):
+            if len(pairs) >= follows:
+                break
+            pair = (rng.choice(user_ids), authors.choice())
+            if pair[0] != pair[1]:
+                pairs.add(pair)
+        Follow.objects.bulk_create(
+            [Follow(user_id=user, author_id=author) for user, author in pairs]
+        )
+    # bulk_create skips signals, so derived data is rebuilt in one pass.
+    call_command("rebuild_counters", stdout=stdout)
+    call_command("rebuild_search_index", stdout=stdout)
+    if settings.TIMELINE_ENABLED:
+        call_command("rebuild_timelines", stdout=stdout)
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.results import compare, load_report
+
+
+class Command(BaseCommand):
+    help = "Сравнивает два JSON-отчёта bench_run"
+
+    def add_arguments(self, parser):
+        parser.add_argument("base")
+        parser.add_argument("new")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Допустимый рост медианы, %%",
+        )
+
+    def handle(self, *args, **options):
+        base = load_report(options["base"])
+        new = load_report(options["new"])
+        self.stdout.write(
+            f'{base.get("commit")} -> {new.get("commit")}'
+        )
+        regressions = []
+        for name, before, after, change, queries, regression in compare(
+            base, new, options["threshold"]
+        ):
+            line = (
+                f"{name:<14} {before:>9.3f} -> {after:>9.3f} мс "
+                f"({change:+.1f}%), запросы {queries}"
+            )
+            if regression:
+                regressions.append(name)
+                line = self.style.ERROR(line)
+            self.stdout.write(line)
+        if regressions:
+            raise CommandError(f'Регрессии: {", ".join(regressions)}')
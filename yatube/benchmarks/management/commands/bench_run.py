@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.results import build_report
+from benchmarks.scenarios import run_scenarios
+
+
+class Command(BaseCommand):
+    help = "Замеряет время и число запросов основных страниц"
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenarios", nargs="*")
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--warm-cache",
+            action="store_true",
+            help="Не очищать кэш между запросами",
+        )
+        parser.add_argument("--output", help="Файл для JSON-отчёта")
+
+    def handle(self, *args, **options):
+        try:
+            scenarios = run_scenarios(
+                options["iterations"],
+                options["scenarios"],
+                options["warm_cache"],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        report = json.dumps(
+            build_report(scenarios, options["warm_cache"]),
+            ensure_ascii=False,
+            indent=2,
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.write(report)
+            for name, result in scenarios.items():
+                self.stdout.write(
+                    f'{name}: {result["median_ms"]} мс, '
+                    f'{result["queries"]} запросов'
+                )
+        else:
+            self.stdout.write(report)
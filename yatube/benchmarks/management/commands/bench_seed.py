@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.generator import generate
+
+
+class Command(BaseCommand):
+    help = "Заполняет базу данными для нагрузочных тестов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--groups", type=int, default=20)
+        parser.add_argument("--posts", type=int, default=20000)
+        parser.add_argument("--comments", type=int, default=50000)
+        parser.add_argument("--follows", type=int, default=20000)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Показатель закона Ципфа для популярности авторов и постов",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        generate(
+            users=options["users"],
+            groups=options["groups"],
+            posts=options["posts"],
+            comments=options["comments"],
+            follows=options["follows"],
+            skew=options["skew"],
+            seed=options["seed"],
+            stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS("Данные созданы"))
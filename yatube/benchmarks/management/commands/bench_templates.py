@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.rendering import compare_loaders
+
+
+class Command(BaseCommand):
+    help = "Сравнивает время рендеринга лент с кэшем шаблонов и без него"
+
+    def add_arguments(self, parser):
+        parser.add_argument("templates", nargs="*")
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            results = compare_loaders(
+                options["iterations"], options["templates"]
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name}: {result["uncached_ms"]} мс без кэша, '
+                f'{result["cached_ms"]} мс с кэшем '
+                f'(x{result["speedup"]})'
+            )
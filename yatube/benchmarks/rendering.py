@@ -0,0 +1,94 @@
+import statistics
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from core.pagination import KeysetPaginator
+from posts.models import Post
+from posts.views import attach_card_versions
+from yatube.settings import QUANTITY
+
+FEED_TEMPLATES = (
+    "posts/index.html",
+    "posts/group_list.html",
+    "posts/profile.html",
+    "posts/follow.html",
+)
+
+
+def build_backend(cached):
+    """A template backend like the configured one, with chosen loaders."""
+    config = settings.TEMPLATES[0]
+    loaders = settings.TEMPLATE_LOADERS
+    if cached:
+        loaders = [("django.template.loaders.cached.Loader", loaders)]
+    return DjangoTemplates({
+        "NAME": "cached" if cached else "uncached",
+        "DIRS": config["DIRS"],
+        "APP_DIRS": False,
+        "OPTIONS": dict(config["OPTIONS"], loaders=loaders),
+    })
+
+
+def feed_page(posts):
+    page = KeysetPaginator(posts, QUANTITY).get_page()
+    page.object_list = attach_card_versions(list(page.object_list))
+    return page
+
+
+def feed_contexts():
+    post = Post.objects.select_related("author", "group").exclude(
+        group=None
+    ).first()
+    if post is None:
+        raise ValueError("Нет данных: сначала выполните bench_seed")
+    group, author = post.group, post.author
+    posts = Post.objects.for_feed()
+    return {
+        "posts/index.html": {"page_obj": feed_page(posts)},
+        "posts/group_list.html": {
+            "group": group,
+            "page_obj": feed_page(posts.filter(group=group)),
+        },
+        "posts/profile.html": {
+            "author": author,
+            "page_obj": feed_page(posts.filter(author=author)),
+            "following": False,
+        },
+        "posts/follow.html": {"page_obj": feed_page(posts)},
+    }
+
+
+def time_renders(backend, name, context, request, iterations):
+    # The first render fills the card fragment cache for both loaders.
+    backend.get_template(name).render(context, request)
+    timings = []
+    for _ in range(iterations):
+        started = perf_counter()
+        backend.get_template(name).render(context, request)
+        timings.append((perf_counter() - started) * 1000)
+    return round(statistics.median(timings), 3)
+
+
+def compare_loaders(iterations, names=None):
+    """Median render time of the feed templates without/with caching."""
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+    contexts = feed_contexts()
+    uncached, cached = build_backend(False), build_backend(True)
+    results = {}
+    for name in FEED_TEMPLATES:
+        if names and name not in names:
+            continue
+        context = contexts[name]
+        before = time_renders(uncached, name, context, request, iterations)
+        after = time_renders(cached, name, context, request, iterations)
+        results[name] = {
+            "uncached_ms": before,
+            "cached_ms": after,
+            "speedup": round(before / after, 2) if after else None,
+        }
+    return results
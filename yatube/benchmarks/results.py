@@ -0,0 +1,63 @@
+import json
+import subprocess
+
+from django.utils import timezone
+
+from posts.models import Comment, Follow, Group, Post, User
+
+FORMAT_VERSION = 1
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(scenarios, warm_cache):
+    return {
+        "format": FORMAT_VERSION,
+        "commit": current_commit(),
+        "created": timezone.now().isoformat(),
+        "warm_cache": warm_cache,
+        "dataset": {
+            model._meta.model_name: model.objects.count()
+            for model in (User, Group, Post, Comment, Follow)
+        },
+        "scenarios": scenarios,
+    }
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as report:
+        return json.load(report)
+
+
+def compare(base, new, threshold):
+    """Rows of (scenario, base ms, new ms, change %, queries, regression)."""
+    rows = []
+    for name, current in new["scenarios"].items():
+        previous = base["scenarios"].get(name)
+        if previous is None:
+            continue
+        change = (
+            (current["median_ms"] - previous["median_ms"])
+            / previous["median_ms"] * 100
+            if previous["median_ms"] else 0.0
+        )
+        regression = (
+            change > threshold or current["queries"] > previous["queries"]
+        )
+        rows.append((
+            name,
+            previous["median_ms"],
+            current["median_ms"],
+            change,
+            f'{previous["queries"]} -> {current["queries"]}',
+            regression,
+        ))
+    return rows
@@ -0,0 +1,82 @@
+import statistics
+from time import perf_counter
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Follow, Group, Post, User
+
+
+def build_scenarios():
+    """Named (method, url, data) requests against the current dataset."""
+    reader = Follow.objects.values("user").annotate(
+        total=Count("pk")
+    ).order_by("-total").values_list("user", flat=True).first()
+    author = User.objects.filter(
+        counters__post_count__gt=0
+    ).order_by("-counters__post_count").first()
+    group = Group.objects.order_by("pk").first()
+    post = Post.objects.annotate(
+        total=Count("comments")
+    ).order_by("-total").first()
+    if not (reader and author and group and post):
+        raise ValueError("Нет данных: сначала выполните bench_seed")
+    return reader, {
+        "index": ("get", reverse("posts:index"), None),
+        "group_posts": (
+            "get", reverse("posts:group_list", args=[group.slug]), None
+        ),
+        "profile": (
+            "get", reverse("posts:profile", args=[author.username]), None
+        ),
+        "post_detail": (
+            "get", reverse("posts:post_detail", args=[post.pk]), None
+        ),
+        "follow_index": ("get", reverse("posts:follow_index"), None),
+        "post_create": (
+            "post", reverse("posts:post_create"),
+            {"text": "Запись из нагрузочного теста"},
+        ),
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenarios(iterations, names=None, warm_cache=False):
+    reader_id, scenarios = build_scenarios()
+    client = Client()
+    client.force_login(User.objects.get(pk=reader_id))
+    results = {}
+    for name, (method, url, data) in scenarios.items():
+        if names and name not in names:
+            continue
+        timings, queries = [], []
+        with transaction.atomic():
+            for _ in range(iterations):
+                if not warm_cache:
+                    cache.clear()
+                with CaptureQueriesContext(connection) as captured:
+                    started = perf_counter()
+                    response = getattr(client, method)(url, data)
+                    timings.append((perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    raise ValueError(f"{name}: ответ {response.status_code}")
+                queries.append(len(captured))
+            transaction.set_rollback(True)
+        results[name] = {
+            "url": url,
+            "iterations": iterations,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(percentile(timings, 0.95), 3),
+            "mean_ms": round(statistics.mean(timings), 3),
+            "queries": int(statistics.median(queries)),
+        }
+    return results
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from posts.models import Comment, Follow, Group, Post, User
+
+from ..generator import generate
+from ..rendering import FEED_TEMPLATES, compare_loaders
+from ..scenarios import run_scenarios
+
+
+class BenchmarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate(
+            users=20, groups=3, posts=60, comments=80, follows=30,
+            stdout=StringIO(),
+        )
+
+    def test_generate_is_reproducible(self):
+        self.assertEqual(User.objects.count(), 20)
+        self.assertEqual(Post.objects.count(), 60)
+        self.assertEqual(Comment.objects.count(), 80)
+        self.assertGreater(Follow.objects.count(), 0)
+        first_text = Post.objects.order_by('pk').first().text
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        generate(
+            users=20, groups=3, posts=60, comments=80, follows=30,
+            stdout=StringIO(),
+        )
+        self.assertEqual(
+            Post.objects.order_by('pk').first().text, first_text
+        )
+
+    def test_run_scenarios_rolls_back_writes(self):
+        posts = Post.objects.count()
+        results = run_scenarios(1)
+        self.assertEqual(Post.objects.count(), posts)
+        for name in ('index', 'group_posts', 'profile', 'post_detail',
+                     'follow_index', 'post_create'):
+            with self.subTest(name=name):
+                self.assertGreater(results[name]['queries'], 0)
+                self.assertGreater(results[name]['median_ms'], 0)
+
+    def test_compare_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as directory:
+            base = os.path.join(directory, 'base.json')
+            new = os.path.join(directory, 'new.json')
+            call_command(
+                'bench_run', 'index', iterations=1, output=base,
+                stdout=StringIO(),
+            )
+            with open(base, encoding='utf-8') as report:
+                data = json.load(report)
+            self.assertEqual(data['dataset']['post'], 60)
+            call_command('bench_compare', base, base, stdout=StringIO())
+            data['scenarios']['index']['queries'] += 1
+            with open(new, 'w', encoding='utf-8') as report:
+                json.dump(data, report)
+            with self.assertRaises(CommandError):
+                call_command('bench_compare', base, new, stdout=StringIO())
+
+    def test_compare_loaders_renders_feed_templates(self):
+        results = compare_loaders(iterations=2)
+        self.assertEqual(set(results), set(FEED_TEMPLATES))
+        for result in results.values():
+            self.assertGreater(result['uncached_ms'], 0)
+            self.assertGreater(result['cached_ms'], 0)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("pk", "task", "status", "attempts", "run_at", "pub_date")
+    list_filter = ("status", "task")
+    empty_value_display = "-пусто-"
@@ -0,0 +1,265 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed);
+CREATE TABLE IF NOT EXISTS cache_usage (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_usage VALUES (1, 0, 0);
+CREATE TRIGGER IF NOT EXISTS cache_entry_insert AFTER INSERT ON cache_entry
+BEGIN
+    UPDATE cache_usage SET entries = entries + 1, size = size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_update
+AFTER UPDATE OF size ON cache_entry
+BEGIN
+    UPDATE cache_usage SET size = size - OLD.size + NEW.size;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entry_delete AFTER DELETE ON cache_entry
+BEGIN
+    UPDATE cache_usage SET entries = entries - 1, size = size - OLD.size;
+END;
+"""
+UPSERT = (
+    "INSERT INTO cache_entry (key, value, expires, accessed, size) "
+    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+    "value = excluded.value, expires = excluded.expires, "
+    "accessed = excluded.accessed, size = excluded.size"
+)
+# SQLite limits the number of bound parameters per statement.
+MAX_PARAMS = 900
+
+
+class SQLiteCache(BaseCache):
+    """Cache shared by all worker processes through one SQLite file.
+
+    Every write is a single ``BEGIN IMMEDIATE`` transaction in WAL mode, so
+    readers never see a half-written entry. Triggers keep the entry count
+    and total size in ``cache_usage``; once ``MAX_ENTRIES`` or ``MAX_SIZE``
+    (bytes) is exceeded, expired entries are dropped first and then the
+    least recently used ones.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._path = location
+        self._max_size = int(options.get("MAX_SIZE", 64 * 1024 * 1024))
+        self._busy_timeout = float(options.get("BUSY_TIMEOUT", 5))
+        # Reads refresh the LRU position at most this often (seconds).
+        self._touch_interval = float(options.get("TOUCH_INTERVAL", 1))
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self._path,
+                timeout=self._busy_timeout,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @contextmanager
+    def _write(self):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def _rows(self, keys):
+        keys = list(keys)
+        connection = self._connection()
+        rows = []
+        for start in range(0, len(keys), MAX_PARAMS):
+            chunk = keys[start:start + MAX_PARAMS]
+            rows += connection.execute(
+                "SELECT key, value, expires, accessed FROM cache_entry "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+        return rows
+
+    def _fresh(self, rows):
+        """Unpickle live rows and refresh their position in the LRU."""
+        now = time.time()
+        found, stale = {}, []
+        for key, value, expires, accessed in rows:
+            if expires is not None and expires <= now:
+                continue
+            found[key] = pickle.loads(value)
+            if now - accessed >= self._touch_interval:
+                stale.append(key)
+        for start in range(0, len(stale), MAX_PARAMS):
+            chunk = stale[start:start + MAX_PARAMS]
+            self._connection().execute(
+                "UPDATE cache_entry SET accessed = ? "
+                f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                [now] + chunk,
+            )
+        return found
+
+    def _usage(self, connection):
+        return connection.execute(
+            "SELECT entries, size FROM cache_usage"
+        ).fetchone()
+
+    def _cull(self, connection, now):
+        entries, size = self._usage(connection)
+        if entries <= self._max_entries and size <= self._max_size:
+            return
+        connection.execute(
+            "DELETE FROM cache_entry WHERE expires <= ?", [now]
+        )
+        entries, size = self._usage(connection)
+        while entries and (
+            entries > self._max_entries or size > self._max_size
+        ):
+            if self._cull_frequency == 0:
+                connection.execute("DELETE FROM cache_entry")
+            else:
+                connection.execute(
+                    "DELETE FROM cache_entry WHERE key IN ("
+                    "SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)",
+                    [max(1, entries // self._cull_frequency)],
+                )
+            entries, size = self._usage(connection)
+
+    def _entry(self, key, value, timeout, now):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return [key, data, self.get_backend_timeout(timeout), now, len(data)]
+
+    def get(self, key, default=None, version=None):
+        found = self._fresh(self._rows([self._key(key, version)]))
+        return next(iter(found.values()), default)
+
+    def get_many(self, keys, version=None):
+        keys = {self._key(key, version): key for key in keys}
+        found = self._fresh(self._rows(keys))
+        return {keys[key]: value for key, value in found.items()}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        with self._write() as connection:
+            connection.execute(UPSERT, self._entry(key, value, timeout, now))
+            self._cull(connection, now)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        now = time.time()
+        entries = [
+            self._entry(self._key(key, version), value, timeout, now)
+            for key, value in data.items()
+        ]
+        with self._write() as connection:
+            connection.executemany(UPSERT, entries)
+            self._cull(connection, now)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        with self._write() as connection:
+            added = connection.execute(
+                UPSERT + " WHERE cache_entry.expires <= ?",
+                self._entry(key, value, timeout, now) + [now],
+            ).rowcount
+            self._cull(connection, now)
+        return bool(added)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        with self._write() as connection:
+            return bool(connection.execute(
+                "UPDATE cache_entry SET expires = ?, accessed = ? "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                [self.get_backend_timeout(timeout), now, key, now],
+            ).rowcount)
+
+    def incr(self, key, delta=1, version=None):
+        key = self._key(key, version)
+        now = time.time()
+        with self._write() as connection:
+            row = connection.execute(
+                "SELECT value FROM cache_entry "
+                "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+                [key, now],
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(row[0]) + delta
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            connection.execute(
+                "UPDATE cache_entry SET value = ?, size = ?, accessed = ? "
+                "WHERE key = ?",
+                [data, len(data), now, key],
+            )
+        return value
+
+    def delete(self, key, version=None):
+        key = self._key(key, version)
+        with self._write() as connection:
+            return bool(connection.execute(
+                "DELETE FROM cache_entry WHERE key = ?", [key]
+            ).rowcount)
+
+    def delete_many(self, keys, version=None):
+        keys = [self._key(key, version) for key in keys]
+        with self._write() as connection:
+            for start in range(0, len(keys), MAX_PARAMS):
+                chunk = keys[start:start + MAX_PARAMS]
+                connection.execute(
+                    "DELETE FROM cache_entry "
+                    f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+
+    def has_key(self, key, version=None):
+        key = self._key(key, version)
+        return self._connection().execute(
+            "SELECT 1 FROM cache_entry "
+            "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            [key, time.time()],
+        ).fetchone() is not None
+
+    def clear(self):
+        with self._write() as connection:
+            connection.execute("DELETE FROM cache_entry")
+
+    def close(self, **kwargs):
+        # The connection is reused across requests of the same thread.
+        pass
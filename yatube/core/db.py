@@ -0,0 +1,66 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on busy_timeout alone.
+    fcntl = None
+
+_local = threading.local()
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply ``SQLITE_PRAGMAS`` to every new SQLite connection."""
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRODUCTION:
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def lock_path(using):
+    if settings.SQLITE_WRITE_LOCK:
+        return settings.SQLITE_WRITE_LOCK
+    return f"{connections[using].settings_dict['NAME']}.lock"
+
+
+@contextmanager
+def write_lock(using=DEFAULT_DB_ALIAS):
+    """Let one writer at a time into SQLite across all worker processes.
+
+    SQLite allows a single writer; a deferred transaction that has to
+    upgrade to a write lock fails with "database is locked" instead of
+    waiting. Holding an exclusive ``flock`` around the transaction makes
+    writers queue up in the OS instead. Re-entrant within a thread.
+    """
+    connection = connections[using]
+    if (
+        fcntl is None
+        or connection.vendor != "sqlite"
+        or not settings.SQLITE_PRODUCTION
+        or getattr(_local, "depth", 0)
+    ):
+        _local.depth = getattr(_local, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            _local.depth -= 1
+        return
+    with open(lock_path(using), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        _local.depth = 1
+        try:
+            yield
+        finally:
+            _local.depth = 0
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+@contextmanager
+def serialized_write(using=DEFAULT_DB_ALIAS):
+    """``transaction.atomic`` that waits its turn for the write lock."""
+    with write_lock(using), transaction.atomic(using=using):
+        yield
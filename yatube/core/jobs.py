@@ -0,0 +1,137 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .db import serialized_write
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+
+def task(func):
+    """Mark ``func`` as runnable by the worker under its dotted path."""
+    func.task_name = f"{func.__module__}.{func.__qualname__}"
+    return func
+
+
+def enqueue(func, *args, **kwargs):
+    """Store a call to ``func`` for ``runworker``.
+
+    The row is written in the caller's transaction, so the job becomes
+    visible to workers only once the surrounding write commits. With
+    ``JOBS_RUN_INLINE`` the call runs immediately instead.
+    """
+    if settings.JOBS_RUN_INLINE:
+        func(*args, **kwargs)
+        return None
+    return Job.objects.create(
+        task=func.task_name,
+        payload=json.dumps({"args": args, "kwargs": kwargs}),
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def schedule(func, delay, *args, **kwargs):
+    """Queue ``func`` to run in ``delay`` seconds unless it already waits.
+
+    Periodic tasks call this at the end of every run to plan the next
+    one. Inline mode has no worker to wait for, so nothing is queued.
+    """
+    if settings.JOBS_RUN_INLINE:
+        return None
+    payload = json.dumps({"args": args, "kwargs": kwargs})
+    if Job.objects.filter(
+        task=func.task_name, payload=payload, status=Job.QUEUED
+    ).exists():
+        return None
+    return Job.objects.create(
+        task=func.task_name,
+        payload=payload,
+        max_attempts=settings.JOBS_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claimable(now):
+    return Q(status=Job.QUEUED, run_at__lte=now) | Q(
+        status=Job.RUNNING, locked_until__lt=now
+    )
+
+
+def claim(limit):
+    now = timezone.now()
+    candidates = Job.objects.filter(claimable(now)).order_by(
+        "run_at"
+    ).values_list("pk", flat=True)[:limit]
+    claimed = []
+    for pk in list(candidates):
+        with serialized_write():
+            updated = Job.objects.filter(claimable(now), pk=pk).update(
+                status=Job.RUNNING,
+                attempts=F("attempts") + 1,
+                locked_until=now + timedelta(
+                    seconds=settings.JOBS_VISIBILITY_TIMEOUT
+                ),
+            )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def run(pk):
+    job = Job.objects.filter(pk=pk).first()
+    if job is None:
+        # Finished by a worker that outlived the visibility timeout.
+        return False
+    # A re-claim bumps ``attempts``: our writes only land while we own it.
+    owned = Job.objects.filter(pk=pk, attempts=job.attempts)
+    if job.attempts > job.max_attempts:
+        with serialized_write():
+            owned.update(status=Job.FAILED)
+        return False
+    try:
+        func = import_string(job.task)
+        if not getattr(func, "task_name", None):
+            raise ValueError(f"{job.task} не является задачей")
+        payload = json.loads(job.payload)
+        func(*payload["args"], **payload["kwargs"])
+    except Exception:
+        logger.exception("Задача %s завершилась с ошибкой", job)
+        if job.attempts >= job.max_attempts:
+            status, run_at = Job.FAILED, job.run_at
+        else:
+            status = Job.QUEUED
+            run_at = timezone.now() + retry_delay(job.attempts)
+        with serialized_write():
+            updated = owned.update(
+                last_error=traceback.format_exc(),
+                locked_until=None,
+                status=status,
+                run_at=run_at,
+            )
+        if not updated:
+            logger.warning("Задачу %s перехватил другой обработчик", job)
+        return False
+    with serialized_write():
+        deleted, _ = owned.delete()
+    if not deleted:
+        logger.warning("Задачу %s перехватил другой обработчик", job)
+    return True
+
+
+def run_in_worker(pk):
+    try:
+        return run(pk)
+    finally:
+        connection.close()
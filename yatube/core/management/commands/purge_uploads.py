@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.uploads import purge
+
+
+class Command(BaseCommand):
+    help = "Удаляет незавершённые и брошенные загрузки файлов"
+
+    def handle(self, *args, **options):
+        removed = purge()
+        self.stdout.write(self.style.SUCCESS(f"Удалено загрузок: {removed}"))
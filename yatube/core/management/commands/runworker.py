@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import claim, run, run_in_worker
+
+
+class Command(BaseCommand):
+    help = "Выполняет фоновые задачи из очереди"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Выполнить накопившиеся задачи и завершиться",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if workers < 1:
+            done = self.drain(lambda claimed: map(run, claimed), 1, options)
+        else:
+            with ThreadPoolExecutor(
+                workers, thread_name_prefix="worker"
+            ) as pool:
+                done = self.drain(
+                    lambda claimed: pool.map(run_in_worker, claimed),
+                    workers,
+                    options,
+                )
+        self.stdout.write(self.style.SUCCESS(f"Выполнено задач: {done}"))
+
+    def drain(self, run_batch, workers, options):
+        done = 0
+        while True:
+            claimed = claim(workers * 2)
+            if claimed:
+                done += sum(run_batch(claimed))
+            elif options["once"]:
+                return done
+            else:
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core.template_loading import warm_templates
+
+
+class Command(BaseCommand):
+    help = "Компилирует все шаблоны и сообщает об ошибках в них"
+
+    def handle(self, *args, **options):
+        warmed = warm_templates()
+        self.stdout.write(self.style.SUCCESS(
+            f"Скомпилировано шаблонов: {warmed}"
+        ))
@@ -0,0 +1,300 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+_local = threading.local()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_sample (
+    metric TEXT NOT NULL,
+    view TEXT NOT NULL,
+    label TEXT NOT NULL,
+    value NOT NULL,
+    PRIMARY KEY (metric, view, label)
+);
+"""
+UPSERT = (
+    "INSERT INTO metric_sample (metric, view, label, value) "
+    "VALUES (?, ?, ?, ?) ON CONFLICT (metric, view, label) "
+    "DO UPDATE SET value = value + excluded.value"
+)
+CACHE_METRIC = "yatube_cache_requests_total"
+
+FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def fingerprint(sql):
+    for pattern, replacement in FINGERPRINT_RULES:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+
+class Registry:
+    """Aggregates shared by all worker processes, in Prometheus format.
+
+    Each request adds its observations to one SQLite file in a single
+    ``BEGIN IMMEDIATE`` transaction, as ``SQLiteCache`` does for cache
+    entries, so whichever gunicorn worker answers ``/metrics`` exports the
+    totals of all of them. Buckets are stored per bound and made
+    cumulative on export.
+    """
+
+    HISTOGRAMS = {
+        "yatube_request_duration_seconds": (
+            "Полное время обработки запроса", LATENCY_BUCKETS
+        ),
+        "yatube_db_queries": ("SQL-запросов за запрос", QUERY_BUCKETS),
+        "yatube_db_query_duration_seconds": (
+            "Время SQL-запросов за запрос", LATENCY_BUCKETS
+        ),
+        "yatube_template_render_seconds": (
+            "Время рендеринга шаблонов за запрос", LATENCY_BUCKETS
+        ),
+    }
+
+    def __init__(self, location=None):
+        self._location = location
+        self._local = threading.local()
+
+    @property
+    def location(self):
+        return self._location or settings.METRICS_LOCATION
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        key = (os.getpid(), self.location)
+        if connection is None or self._local.key != key:
+            directory = os.path.dirname(self.location)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self.location, timeout=5, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+            self._local.key = key
+        return connection
+
+    @contextmanager
+    def _write(self):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def reset(self):
+        with self._write() as connection:
+            connection.execute("DELETE FROM metric_sample")
+
+    def record(self, view, stats, duration):
+        observed = {
+            "yatube_request_duration_seconds": duration,
+            "yatube_db_queries": stats.query_count,
+            "yatube_db_query_duration_seconds": stats.query_time,
+            "yatube_template_render_seconds": stats.template_time,
+        }
+        rows = []
+        for name, value in observed.items():
+            bucket = bisect_left(self.HISTOGRAMS[name][1], value)
+            rows += [
+                (name, view, str(bucket), 1),
+                (name, view, "sum", value),
+                (name, view, "count", 1),
+            ]
+        rows += [
+            (CACHE_METRIC, view, "hit", stats.cache_hits),
+            (CACHE_METRIC, view, "miss", stats.cache_misses),
+        ]
+        try:
+            with self._write() as connection:
+                connection.executemany(UPSERT, rows)
+        except sqlite3.Error:
+            # Metrics must never fail the request they describe.
+            logger.exception("Не удалось сохранить метрики запроса")
+
+    def load(self):
+        """Histograms by metric and view, and cache counts by view."""
+        histograms = {
+            name: defaultdict(lambda buckets=buckets: Histogram(buckets))
+            for name, (_, buckets) in self.HISTOGRAMS.items()
+        }
+        cache = Counter()
+        rows = self._connection().execute(
+            "SELECT metric, view, label, value FROM metric_sample"
+        )
+        for name, view, label, value in rows:
+            if name == CACHE_METRIC:
+                cache[view, label] = int(value)
+            elif name in histograms:
+                histogram = histograms[name][view]
+                if label == "sum":
+                    histogram.sum = float(value)
+                elif label == "count":
+                    histogram.total = int(value)
+                else:
+                    histogram.counts[int(label)] = int(value)
+        return histograms, cache
+
+    def export(self):
+        histograms, cache = self.load()
+        lines = []
+        for name, (help_text, _) in self.HISTOGRAMS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for view, histogram in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, count in zip(
+                    histogram.buckets + ("+Inf",), histogram.counts
+                ):
+                    cumulative += count
+                    lines.append(
+                        f'{name}_bucket{{view="{view}",le="{bound}"}} '
+                        f"{cumulative}"
+                    )
+                lines.append(f'{name}_sum{{view="{view}"}} {histogram.sum}')
+                lines.append(
+                    f'{name}_count{{view="{view}"}} {histogram.total}'
+                )
+        lines.append(f"# HELP {CACHE_METRIC} Обращения к кэшу")
+        lines.append(f"# TYPE {CACHE_METRIC} counter")
+        for (view, result), total in sorted(cache.items()):
+            lines.append(
+                f'{CACHE_METRIC}{{view="{view}",result="{result}"}} {total}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class RequestStats:
+    def __init__(self, keep_queries):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.keep_queries = keep_queries
+        self.queries = []
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_count += 1
+            self.query_time += perf_counter() - started
+            if len(self.queries) < self.keep_queries:
+                self.queries.append(sql)
+
+    def frequent_fingerprints(self, limit=5):
+        return Counter(map(fingerprint, self.queries)).most_common(limit)
+
+
+def current():
+    return getattr(_local, "stats", None)
+
+
+def activate(stats):
+    _local.stats = stats
+
+
+def deactivate():
+    _local.stats = None
+
+
+def timed_render(render):
+    @wraps(render)
+    def wrapper(*args, **kwargs):
+        stats = current()
+        if stats is None:
+            return render(*args, **kwargs)
+        started = perf_counter()
+        try:
+            return render(*args, **kwargs)
+        finally:
+            stats.template_time += perf_counter() - started
+    wrapper.metrics_installed = True
+    return wrapper
+
+
+def counted_get(get):
+    @wraps(get)
+    def wrapper(self, key, default=None, version=None):
+        value = get(self, key, default, version)
+        stats = current()
+        if stats is not None:
+            if value is default:
+                stats.cache_misses += 1
+            else:
+                stats.cache_hits += 1
+        return value
+    wrapper.metrics_installed = True
+    return wrapper
+
+
+def counted_get_many(get_many):
+    @wraps(get_many)
+    def wrapper(self, keys, version=None):
+        found = get_many(self, keys, version)
+        stats = current()
+        if stats is not None:
+            stats.cache_hits += len(found)
+            stats.cache_misses += len(keys) - len(found)
+        return found
+    wrapper.metrics_installed = True
+    return wrapper
+
+
+def install():
+    """Patch the template backend and cache backends once per process."""
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.template.backends.django import Template
+
+    if not getattr(Template.render, "metrics_installed", False):
+        Template.render = timed_render(Template.render)
+    for alias in settings.CACHES:
+        backend = type(caches[alias])
+        if not getattr(backend.get, "metrics_installed", False):
+            backend.get = counted_get(backend.get)
+        # BaseCache.get_many() calls get(), which is already counted.
+        if "get_many" in vars(backend) and not getattr(
+            backend.get_many, "metrics_installed", False
+        ):
+            backend.get_many = counted_get_many(backend.get_many)
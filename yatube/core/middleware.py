@@ -0,0 +1,77 @@
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics, routers
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        metrics.install()
+
+    def __call__(self, request):
+        stats = metrics.RequestStats(settings.METRICS_KEEP_QUERIES)
+        metrics.activate(stats)
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(stats.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            metrics.deactivate()
+        duration = perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        metrics.registry.record(view, stats, duration)
+        if duration >= settings.METRICS_SLOW_REQUEST:
+            logger.warning(
+                "Медленный запрос %s %s (%s): %.3f с, SQL: %d за %.3f с, "
+                "шаблоны: %.3f с, частые запросы: %s",
+                request.method, request.path, view, duration,
+                stats.query_count, stats.query_time, stats.template_time,
+                stats.frequent_fingerprints(),
+            )
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """Allow safe requests to read from a replica unless the user just wrote.
+
+    A write sets a short-lived cookie, and while it is present every
+    request of that browser reads from the primary, so users always see
+    their own posts and comments despite replication lag. Views opt in
+    with ``routers.replica_reads``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        routers.forget_writes()
+        request.replica_allowed = (
+            request.method in SAFE_METHODS
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+        )
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS or routers.wrote_to_primary():
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
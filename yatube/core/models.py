@@ -1,4 +1,9 @@
+import os
+from uuid import uuid4
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class CreatedModel(models.Model):
@@ -9,3 +14,74 @@ class CreatedModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class Job(CreatedModel):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+    STATUSES = (
+        (QUEUED, "В очереди"),
+        (RUNNING, "Выполняется"),
+        (FAILED, "Ошибка"),
+    )
+
+    task = models.CharField("Задача", max_length=200)
+    payload = models.TextField("Аргументы", default="{}")
+    status = models.CharField(
+        "Статус",
+        max_length=10,
+        choices=STATUSES,
+        default=QUEUED,
+    )
+    attempts = models.PositiveSmallIntegerField("Попыток", default=0)
+    max_attempts = models.PositiveSmallIntegerField(
+        "Максимум попыток",
+        default=5
+    )
+    run_at = models.DateTimeField("Запустить после", default=timezone.now)
+    locked_until = models.DateTimeField(
+        "Заблокирована до",
+        blank=True,
+        null=True
+    )
+    last_error = models.TextField("Последняя ошибка", blank=True)
+
+    class Meta:
+        verbose_name = "фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        indexes = [
+            models.Index(
+                name="job_status_run_at",
+                fields=["status", "run_at"],
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk}"
+
+
+class Upload(CreatedModel):
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="uploads",
+        verbose_name="Пользователь",
+    )
+    filename = models.CharField("Имя файла", max_length=255)
+    size = models.BigIntegerField("Размер")
+    offset = models.BigIntegerField("Получено байт", default=0)
+    sha256 = models.CharField("Контрольная сумма SHA-256", max_length=64)
+    complete = models.BooleanField("Завершена", default=False)
+
+    class Meta:
+        verbose_name = "загрузка"
+        verbose_name_plural = "Загрузки"
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+    @property
+    def path(self):
+        return os.path.join(settings.UPLOAD_TEMP_DIR, f"{self.pk.hex}.part")
@@ -0,0 +1,135 @@
+import base64
+import binascii
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_token(values):
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_token(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise InvalidCursor(token)
+
+
+def encode_cursor(obj, direction, number):
+    return encode_token(
+        [direction, obj.pub_date.isoformat(), obj.pk, number]
+    )
+
+
+def decode_cursor(token):
+    try:
+        direction, pub_date, pk, number = decode_token(token)
+        pub_date = parse_datetime(pub_date)
+        pk, number = int(pk), int(number)
+    except (TypeError, ValueError):
+        raise InvalidCursor(token)
+    if direction not in (NEXT, PREVIOUS) or pub_date is None or number < 1:
+        raise InvalidCursor(token)
+    return direction, pub_date, pk, number
+
+
+class KeysetPaginator(Paginator):
+    """Seek pagination over ``(pub_date, id)`` descending.
+
+    Pages reached through a ``cursor`` cost one ``LIMIT`` query regardless
+    of depth and never run ``COUNT(*)``. Legacy ``?page=N`` numbers still
+    fall back to the regular offset paginator.
+    """
+
+    def __init__(self, object_list, per_page, approximate_total=False,
+                 **kwargs):
+        super().__init__(
+            object_list.order_by("-pub_date", "-pk"), per_page, **kwargs
+        )
+        self.approximate_total = approximate_total
+        self._seek_num_pages = None
+
+    @cached_property
+    def count(self):
+        if not self.approximate_total:
+            return super().count
+        sql = str(self.object_list.query).encode()
+        key = "approximate_count:" + hashlib.md5(sql).hexdigest()
+        total = cache.get(key)
+        if total is None:
+            total = super().count
+            cache.set(key, total, settings.APPROXIMATE_COUNT_TIMEOUT)
+        return total
+
+    @property
+    def num_pages(self):
+        if self._seek_num_pages is not None:
+            return self._seek_num_pages
+        return self._offset_num_pages
+
+    @cached_property
+    def _offset_num_pages(self):
+        return Paginator.num_pages.func(self)
+
+    def get_page(self, number=None, cursor=None):
+        if cursor:
+            try:
+                return self.seek(*decode_cursor(cursor))
+            except InvalidCursor:
+                pass
+        elif number:
+            return super().get_page(number)
+        return self.seek()
+
+    def seek(self, direction=NEXT, pub_date=None, pk=None, number=1):
+        queryset = self.object_list
+        if direction == PREVIOUS:
+            queryset = queryset.reverse()
+        if pub_date is not None:
+            if direction == NEXT:
+                boundary = Q(pub_date__lt=pub_date) | Q(
+                    pub_date=pub_date, pk__lt=pk
+                )
+            else:
+                boundary = Q(pub_date__gt=pub_date) | Q(
+                    pub_date=pub_date, pk__gt=pk
+                )
+            queryset = queryset.filter(boundary)
+        rows = list(queryset[:self.per_page + 1])
+        if not rows and pub_date is not None:
+            return self.seek()
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if direction == PREVIOUS:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, pub_date is not None
+        number = number if has_previous else 1
+        self._seek_num_pages = number + 1 if has_next else number
+        page = Page(rows, number, self)
+        page.keyset = True
+        page.next_cursor = (
+            encode_cursor(rows[-1], NEXT, number + 1) if has_next else None
+        )
+        page.previous_cursor = (
+            encode_cursor(rows[0], PREVIOUS, number - 1)
+            if has_previous else None
+        )
+        return page
@@ -0,0 +1,75 @@
+import random
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_local = threading.local()
+# A lagging replica must never log a user out or accept an old password.
+PRIMARY_APPS = {"auth", "sessions"}
+
+
+@contextmanager
+def read_from_replica():
+    """Route reads to one replica until the first write in this block.
+
+    Everything outside such a block, including management commands and
+    the job worker, reads from the primary.
+    """
+    _local.replica = None
+    if settings.DATABASE_REPLICAS:
+        _local.replica = random.choice(settings.DATABASE_REPLICAS)
+    try:
+        yield
+    finally:
+        _local.replica = None
+
+
+def replica_reads(view):
+    """Let ``view`` read from a replica when the middleware allows it.
+
+    Only feed and detail views are decorated; every other view, and the
+    session and auth lookups everywhere, read from the primary.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not getattr(request, "replica_allowed", False):
+            return view(request, *args, **kwargs)
+        with read_from_replica():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+def forget_writes():
+    _local.wrote = False
+
+
+def wrote_to_primary():
+    return getattr(_local, "wrote", False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = getattr(_local, "replica", None)
+        if (
+            replica is None
+            or model._meta.app_label in PRIMARY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes: the rest of the request stays on the primary.
+        _local.replica = None
+        _local.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas are copies of the primary and never migrated directly.
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,36 @@
+from django.http import StreamingHttpResponse
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+MARKER = mark_safe("<!-- stream-items -->")
+
+
+def stream_template(request, template_name, context, load_page,
+                    item_template, item_name, separator=""):
+    """Render ``template_name`` as a ``StreamingHttpResponse``.
+
+    The page is rendered with ``stream_marker`` in place of the item loop
+    and without ``page_obj``, so no item is rendered and the page query has
+    not run. Everything before the marker (head, navigation, page header)
+    is the first chunk. Only then ``load_page`` runs the query, and each
+    item is rendered with ``item_template`` and sent on its own. The part
+    after the marker, with the paginator and footer, is rendered last,
+    once the page and its cursors are known.
+    """
+    skeleton = {**context, "stream_marker": MARKER}
+    head = render_to_string(template_name, skeleton, request).split(MARKER)[0]
+    template = get_template(item_template)
+
+    def chunks():
+        yield head
+        page_obj = load_page()
+        for number, item in enumerate(page_obj.object_list):
+            if number:
+                yield separator
+            yield template.render({**context, item_name: item})
+        page = render_to_string(
+            template_name, {**skeleton, "page_obj": page_obj}, request
+        )
+        yield page.split(MARKER, 1)[1]
+
+    return StreamingHttpResponse(chunks())
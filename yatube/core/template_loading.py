@@ -0,0 +1,46 @@
+import logging
+import os
+
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = (".html", ".txt", ".xml")
+
+
+def template_names(engine):
+    names = set()
+    for loader in engine.template_loaders:
+        for source in getattr(loader, "loaders", [loader]):
+            for directory in source.get_dirs():
+                for root, _, files in os.walk(directory):
+                    names.update(
+                        os.path.relpath(os.path.join(root, name), directory)
+                        .replace(os.sep, "/")
+                        for name in files
+                        if name.endswith(TEMPLATE_EXTENSIONS)
+                    )
+    return sorted(names)
+
+
+def warm_templates():
+    """Compile every template and return how many compiled.
+
+    With the cached loader the compiled templates are kept, so includes
+    and ``extends`` are resolved from memory from the first request on
+    instead of being read and parsed by each worker.
+    """
+    warmed = 0
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                logger.warning("Шаблон %s не скомпилирован: %s", name, error)
+            else:
+                warmed += 1
+    return warmed
@@ -0,0 +1,42 @@
+import copy
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+@contextmanager
+def temporary_files():
+    """Point the cache and metrics files at a throwaway directory.
+
+    Like the temporary ``MEDIA_ROOT`` and ``UPLOAD_TEMP_DIR`` of the tests,
+    this keeps test data out of the files shared with the server.
+    """
+    directory = tempfile.mkdtemp(prefix="yatube-test-")
+    caches = copy.deepcopy(settings.CACHES)
+    caches["default"]["LOCATION"] = os.path.join(directory, "cache.sqlite3")
+    try:
+        with override_settings(
+            CACHES=caches,
+            METRICS_LOCATION=os.path.join(directory, "metrics.sqlite3"),
+        ):
+            yield
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+class TemporaryFilesRunner(DiscoverRunner):
+    """``manage.py test`` runner using ``temporary_files``."""
+
+    def setup_test_environment(self, **kwargs):
+        self._files = temporary_files()
+        self._files.__enter__()
+        super().setup_test_environment(**kwargs)
+
+    def teardown_test_environment(self, **kwargs):
+        super().teardown_test_environment(**kwargs)
+        self._files.__exit__(None, None, None)
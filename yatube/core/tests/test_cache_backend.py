@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from ..cache_backend import SQLiteCache
+
+
+def write_from_child(location):
+    SQLiteCache(location, {}).set('child', 'из другого процесса')
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.location = os.path.join(self.directory, 'cache.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def make_cache(self, **options):
+        return SQLiteCache(self.location, {'OPTIONS': options})
+
+    def test_basic_operations(self):
+        cache = self.make_cache()
+        cache.set('key', {'value': 1})
+        self.assertEqual(cache.get('key'), {'value': 1})
+        self.assertFalse(cache.add('key', 'другое'))
+        self.assertTrue(cache.add('new', 'значение', None))
+        self.assertEqual(
+            cache.get_many(['key', 'new', 'missing']),
+            {'key': {'value': 1}, 'new': 'значение'},
+        )
+        cache.set('counter', 1)
+        self.assertEqual(cache.incr('counter', 2), 3)
+        cache.delete_many(['key', 'new'])
+        self.assertFalse(cache.has_key('key'))
+        cache.clear()
+        self.assertIsNone(cache.get('counter'))
+
+    def test_expired_entries_are_missing(self):
+        cache = self.make_cache()
+        cache.set('key', 'значение', 0.01)
+        time.sleep(0.02)
+        self.assertEqual(cache.get('key', 'нет'), 'нет')
+        self.assertTrue(cache.add('key', 'снова'))
+        self.assertEqual(cache.get('key'), 'снова')
+
+    def test_least_recently_used_evicted(self):
+        cache = self.make_cache(
+            MAX_ENTRIES=3, CULL_FREQUENCY=3, TOUCH_INTERVAL=0
+        )
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key)
+            time.sleep(0.01)
+        cache.get('a')
+        cache.set('d', 'd')
+        self.assertEqual(cache.get_many(['a', 'b', 'c', 'd']), {
+            'a': 'a', 'c': 'c', 'd': 'd'
+        })
+
+    def test_size_limit(self):
+        cache = self.make_cache(MAX_SIZE=10000)
+        for number in range(10):
+            cache.set(number, 'x' * 3000)
+        entries, size = cache._usage(cache._connection())
+        self.assertLessEqual(size, 10000)
+        self.assertEqual(
+            entries, len(cache.get_many(range(10)))
+        )
+        self.assertEqual(cache.get(9), 'x' * 3000)
+
+    def test_shared_between_processes(self):
+        process = multiprocessing.get_context('fork').Process(
+            target=write_from_child, args=[self.location]
+        )
+        cache = self.make_cache()
+        cache.set('parent', 'значение')
+        process.start()
+        process.join()
+        self.assertEqual(cache.get('child'), 'из другого процесса')
+
+
+class CacheSettingsTests(SimpleTestCase):
+    def test_tests_use_temporary_cache(self):
+        location = settings.CACHES['default']['LOCATION']
+        self.assertTrue(location.startswith(tempfile.gettempdir()))
+        self.assertFalse(location.startswith(settings.BASE_DIR))
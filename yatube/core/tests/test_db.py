@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, override_settings
+
+from ..db import write_lock
+
+LOCK_DIR = tempfile.mkdtemp()
+LOCK_FILE = os.path.join(LOCK_DIR, 'db.sqlite3.lock')
+
+
+@override_settings(SQLITE_PRODUCTION=True, SQLITE_WRITE_LOCK=LOCK_FILE)
+class SQLiteProductionTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(LOCK_DIR, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_pragmas_applied_to_new_connections(self):
+        database = DatabaseWrapper({
+            **connection.settings_dict,
+            'NAME': os.path.join(LOCK_DIR, 'db.sqlite3'),
+        })
+        try:
+            with database.cursor() as cursor:
+                for name, value in (
+                    ('journal_mode', 'wal'),
+                    ('synchronous', 1),
+                    ('busy_timeout', 20000),
+                    ('cache_size', -64 * 1024),
+                ):
+                    with self.subTest(name=name):
+                        cursor.execute(f'PRAGMA {name}')
+                        self.assertEqual(cursor.fetchone()[0], value)
+        finally:
+            database.close()
+
+    def test_writers_queue_for_lock(self):
+        events = []
+        locked = threading.Event()
+
+        def first():
+            with write_lock():
+                locked.set()
+                time.sleep(0.1)
+                events.append('first done')
+
+        def second():
+            locked.wait()
+            with write_lock():
+                events.append('second in')
+
+        threads = [threading.Thread(target=first),
+                   threading.Thread(target=second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(events, ['first done', 'second in'])
+
+    def test_write_lock_is_reentrant(self):
+        with write_lock():
+            with write_lock():
+                pass
+        with write_lock():
+            pass
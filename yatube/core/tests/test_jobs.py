@@ -0,0 +1,100 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.db.models import F
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..jobs import claim, enqueue, run, task
+from ..models import Job
+
+CALLS = []
+
+
+@task
+def record(value):
+    CALLS.append(value)
+
+
+@task
+def explode():
+    raise RuntimeError('Сбой задачи')
+
+
+@task
+def reclaimed():
+    # Another worker claims the job while this one is still running it.
+    Job.objects.update(attempts=F('attempts') + 1)
+
+
+def run_worker():
+    call_command('runworker', '--once', '--workers=0', stdout=StringIO())
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueued_job_runs_in_worker(self):
+        enqueue(record, 'значение')
+        self.assertEqual(CALLS, [])
+        run_worker()
+        self.assertEqual(CALLS, ['значение'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_later(self):
+        job = enqueue(explode)
+        run_worker()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn('Сбой задачи', job.last_error)
+
+    def test_job_fails_after_max_attempts(self):
+        job = enqueue(explode)
+        Job.objects.filter(pk=job.pk).update(max_attempts=1)
+        self.assertEqual(claim(1), [job.pk])
+        self.assertFalse(run(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_expired_job_is_claimed_again(self):
+        job = enqueue(record, 'повтор')
+        self.assertEqual(claim(1), [job.pk])
+        self.assertEqual(claim(1), [])
+        Job.objects.filter(pk=job.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(claim(1), [job.pk])
+
+    def test_missing_job_is_skipped(self):
+        job = enqueue(record, 'готово')
+        Job.objects.filter(pk=job.pk).delete()
+        self.assertFalse(run(job.pk))
+        self.assertEqual(CALLS, [])
+
+    def test_reclaimed_job_is_left_to_new_owner(self):
+        job = enqueue(reclaimed)
+        self.assertEqual(claim(1), [job.pk])
+        with self.assertLogs('core.jobs', 'WARNING'):
+            self.assertTrue(run(job.pk))
+        self.assertTrue(Job.objects.filter(pk=job.pk).exists())
+
+    def test_password_reset_email_is_queued(self):
+        get_user_model().objects.create_user(
+            'auth', email='auth@example.com', password='password'
+        )
+        Client().post(
+            reverse('users:password_reset_form'),
+            {'email': 'auth@example.com'},
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(Job.objects.count(), 1)
+        run_worker()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['auth@example.com'])
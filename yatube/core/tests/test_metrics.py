@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from ..metrics import Registry, RequestStats, fingerprint, registry
+
+INDEX = reverse('posts:index')
+METRICS = reverse('metrics')
+
+
+def record_from_child(location):
+    stats = RequestStats(0)
+    stats.query_count = 3
+    Registry(location).record('posts:index', stats, 0.2)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+
+    def test_metrics_export_view_histograms(self):
+        self.client.get(INDEX)
+        self.client.get(INDEX)
+        response = self.client.get(METRICS)
+        self.assertEqual(response.status_code, 200)
+        content = response.content.decode()
+        for line in (
+            'yatube_request_duration_seconds_count{view="posts:index"} 2',
+            'yatube_db_queries_count{view="posts:index"} 2',
+            'yatube_template_render_seconds_bucket{view="posts:index",'
+            'le="+Inf"} 2',
+            'yatube_cache_requests_total{view="posts:index",result="hit"}',
+        ):
+            with self.subTest(line=line):
+                self.assertIn(line, content)
+
+    def test_metrics_hidden_from_other_hosts(self):
+        response = Client(REMOTE_ADDR='10.0.0.1').get(METRICS)
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(METRICS_SLOW_REQUEST=0)
+    def test_slow_request_logged_with_fingerprints(self):
+        with self.assertLogs('core.middleware', 'WARNING') as logs:
+            self.client.get(INDEX)
+        self.assertIn('posts:index', logs.output[0])
+        self.assertIn('posts_post', logs.output[0])
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 'x' AND b IN (1, 2, 3)"),
+            'SELECT * FROM t WHERE a = ? AND b IN (?)',
+        )
+
+
+class SharedRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.location = os.path.join(self.directory, 'metrics.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_workers_share_aggregates(self):
+        process = multiprocessing.get_context('fork').Process(
+            target=record_from_child, args=[self.location]
+        )
+        registry = Registry(self.location)
+        registry.record('posts:index', RequestStats(0), 0.02)
+        process.start()
+        process.join()
+        content = registry.export()
+        for line in (
+            'yatube_request_duration_seconds_count{view="posts:index"} 2',
+            'yatube_request_duration_seconds_bucket{view="posts:index",'
+            'le="0.025"} 1',
+            'yatube_request_duration_seconds_bucket{view="posts:index",'
+            'le="0.25"} 2',
+            'yatube_db_queries_sum{view="posts:index"} 3',
+        ):
+            with self.subTest(line=line):
+                self.assertIn(line, content)
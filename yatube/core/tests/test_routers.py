@@ -0,0 +1,67 @@
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from posts.models import Post, User
+
+from ..middleware import ReplicaPinningMiddleware
+from ..routers import replica_reads
+
+PIN_COOKIE = 'primary_pin'
+
+
+def plain_view(request):
+    return HttpResponse(router.db_for_read(Post))
+
+
+reading_view = replica_reads(plain_view)
+
+
+@replica_reads
+def account_view(request):
+    return HttpResponse(router.db_for_read(User))
+
+
+@replica_reads
+def writing_view(request):
+    router.db_for_write(Post)
+    return HttpResponse(router.db_for_read(Post))
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def call(self, view, request):
+        return ReplicaPinningMiddleware(view)(request)
+
+    def test_safe_requests_read_from_replica(self):
+        response = self.call(reading_view, self.factory.get('/'))
+        self.assertEqual(response.content, b'replica_1')
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_undecorated_views_and_accounts_use_primary(self):
+        for view in (plain_view, account_view):
+            with self.subTest(view=view):
+                response = self.call(view, self.factory.get('/'))
+                self.assertEqual(response.content, b'default')
+
+    def test_write_pins_following_reads_to_primary(self):
+        response = self.call(writing_view, self.factory.get('/'))
+        self.assertEqual(response.content, b'default')
+        self.assertIn(PIN_COOKIE, response.cookies)
+        request = self.factory.get('/')
+        request.COOKIES[PIN_COOKIE] = '1'
+        response = self.call(reading_view, request)
+        self.assertEqual(response.content, b'default')
+
+    def test_unsafe_requests_use_primary(self):
+        response = self.call(reading_view, self.factory.post('/'))
+        self.assertEqual(response.content, b'default')
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Post), 'default')
+        self.assertTrue(router.allow_migrate('default', 'posts'))
+        self.assertFalse(router.allow_migrate('replica_1', 'posts'))
@@ -0,0 +1,32 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test import SimpleTestCase
+
+from ..template_loading import template_names, warm_templates
+
+
+class TemplateLoadingTests(SimpleTestCase):
+    def setUp(self):
+        self.engine = engines['django'].engine
+        self.loader = self.engine.template_loaders[0]
+        self.loader.reset()
+
+    def test_production_profile_uses_cached_loader(self):
+        self.assertIsInstance(self.loader, CachedLoader)
+
+    def test_template_names_cover_project_and_apps(self):
+        names = template_names(self.engine)
+        for name in ('base.html', 'includes/header.html',
+                     'posts/includes/paginator.html', 'admin/base.html'):
+            self.assertIn(name, names)
+
+    def test_warm_templates_fills_cache(self):
+        warmed = warm_templates()
+        self.assertGreater(warmed, 0)
+        self.assertEqual(len(self.loader.get_template_cache), warmed)
+        out = StringIO()
+        call_command('warm_templates', stdout=out)
+        self.assertIn(str(warmed), out.getvalue())
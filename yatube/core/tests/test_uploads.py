@@ -0,0 +1,163 @@
+import hashlib
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from posts.models import Post, User
+
+from .. import uploads
+from ..models import Upload
+
+TEMP_DIR = tempfile.mkdtemp(dir=settings.BASE_DIR)
+UPLOAD_CREATE = reverse('upload_create')
+POST_CREATE = reverse('posts:post_create')
+
+
+def image_bytes():
+    buffer = BytesIO()
+    # Noise does not compress, so the file spans several chunks.
+    Image.effect_noise((64, 48), 64).convert('RGB').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@override_settings(
+    UPLOAD_TEMP_DIR=TEMP_DIR + '/uploads',
+    MEDIA_ROOT=TEMP_DIR + '/media',
+    UPLOAD_CHUNK_MAX_SIZE=1024,
+)
+class ChunkedUploadTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user('auth')
+        cls.other = User.objects.create_user('other')
+        cls.data = image_bytes()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_DIR, ignore_errors=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def start(self, data=None, sha256=None):
+        data = self.data if data is None else data
+        response = self.client.post(UPLOAD_CREATE, {
+            'filename': 'photo.png',
+            'size': len(data),
+            'sha256': sha256 or hashlib.sha256(data).hexdigest(),
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def put(self, url, start, end, data=None):
+        data = self.data if data is None else data
+        return self.client.put(
+            url,
+            data[start:end + 1],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(data)}',
+        )
+
+    def send_all(self, state, data=None):
+        data = self.data if data is None else data
+        while not state['complete']:
+            end = min(state['offset'] + 1024, len(data)) - 1
+            response = self.put(state['url'], state['offset'], end, data)
+            state = response.json()
+        return state
+
+    def test_chunks_are_assembled_and_verified(self):
+        state = self.send_all(self.start())
+        upload = Upload.objects.get(pk=state['id'])
+        self.assertTrue(upload.complete)
+        with open(upload.path, 'rb') as file:
+            self.assertEqual(file.read(), self.data)
+
+    def test_out_of_order_chunk_returns_offset_to_resume(self):
+        state = self.start()
+        self.put(state['url'], 0, 999)
+        response = self.put(state['url'], 2000, 2999)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 1000)
+        resumed = self.client.get(state['url']).json()
+        self.assertEqual(resumed['offset'], 1000)
+        self.assertTrue(self.send_all(resumed)['complete'])
+
+    def test_checksum_mismatch_restarts_upload(self):
+        state = self.start(sha256='0' * 64)
+        while True:
+            end = min(state['offset'] + 1024, len(self.data)) - 1
+            response = self.put(state['url'], state['offset'], end)
+            state = response.json()
+            if response.status_code != 200:
+                break
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(state['offset'], 0)
+        self.assertFalse(state['complete'])
+
+    def test_invalid_requests(self):
+        response = self.client.post(UPLOAD_CREATE, {
+            'filename': 'huge.png',
+            'size': settings.UPLOAD_MAX_SIZE + 1,
+            'sha256': '0' * 64,
+        })
+        self.assertEqual(response.status_code, 413)
+        state = self.start()
+        response = self.put(state['url'], 0, 2000)
+        self.assertEqual(response.status_code, 413)
+        stranger = Client()
+        stranger.force_login(self.other)
+        self.assertEqual(stranger.get(state['url']).status_code, 404)
+
+    def test_post_form_takes_upload_id(self):
+        state = self.send_all(self.start())
+        self.client.post(POST_CREATE, {
+            'text': 'Пост из частей', 'upload': state['id'],
+        })
+        post = Post.objects.get()
+        self.assertTrue(post.image)
+        self.assertEqual((post.image_width, post.image_height), (64, 48))
+        self.assertFalse(Upload.objects.exists())
+
+    def test_invalid_form_closes_upload(self):
+        state = self.send_all(self.start())
+        opened, original = [], uploads.finished_file
+
+        def finished_file(user, upload_id):
+            opened.append(original(user, upload_id))
+            return opened[-1]
+
+        with mock.patch.object(uploads, 'finished_file', finished_file):
+            self.client.post(POST_CREATE, {'upload': state['id']})
+        self.assertFalse(Post.objects.exists())
+        self.assertTrue(opened[0].closed)
+        self.assertTrue(Upload.objects.filter(pk=state['id']).exists())
+
+    def test_unfinished_upload_is_not_accepted(self):
+        state = self.start()
+        self.put(state['url'], 0, 999)
+        response = self.client.post(POST_CREATE, {
+            'text': 'Пост', 'upload': state['id'],
+        })
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Post.objects.exists())
+
+    def test_purge_uploads_removes_abandoned(self):
+        state = self.start()
+        Upload.objects.filter(pk=state['id']).update(
+            pub_date=timezone.now() - timedelta(days=2)
+        )
+        call_command('purge_uploads', stdout=StringIO())
+        self.assertFalse(Upload.objects.exists())
@@ -0,0 +1,153 @@
+import hashlib
+import os
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.http import Http404
+from django.utils import timezone
+
+from .db import serialized_write
+from .models import Upload
+
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+SHA256 = re.compile(r"[0-9a-f]{64}")
+# Bytes copied from the request stream to disk per read.
+BUFFER_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def create(user, filename, size, sha256):
+    filename = os.path.basename(filename or "").strip()
+    sha256 = (sha256 or "").lower()
+    try:
+        size = int(size)
+    except (TypeError, ValueError):
+        raise UploadError("Не указан размер файла")
+    if not filename:
+        raise UploadError("Не указано имя файла")
+    if not 0 < size <= settings.UPLOAD_MAX_SIZE:
+        raise UploadError("Недопустимый размер файла", status=413)
+    if not SHA256.fullmatch(sha256):
+        raise UploadError("Контрольная сумма должна быть SHA-256")
+    with serialized_write():
+        upload = Upload.objects.create(
+            user=user, filename=filename[:255], size=size, sha256=sha256
+        )
+    os.makedirs(settings.UPLOAD_TEMP_DIR, exist_ok=True)
+    open(upload.path, "wb").close()
+    return upload
+
+
+def parse_range(header, upload):
+    """``(start, length)`` from a ``Content-Range`` header."""
+    match = CONTENT_RANGE.fullmatch(header or "")
+    if match is None:
+        raise UploadError("Нужен заголовок Content-Range: bytes a-b/size")
+    start, end, total = map(int, match.groups())
+    if total != upload.size or end < start or end >= total:
+        raise UploadError("Диапазон не совпадает с размером файла", 416)
+    if start != upload.offset:
+        raise UploadError("Ожидается продолжение с другого смещения", 409)
+    if end - start + 1 > settings.UPLOAD_CHUNK_MAX_SIZE:
+        raise UploadError("Слишком большой фрагмент", 413)
+    return start, end - start + 1
+
+
+def checksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(BUFFER_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_chunk(upload, stream, content_range):
+    """Append one byte range read from ``stream``; return the upload.
+
+    The body is copied to disk in ``BUFFER_SIZE`` blocks, so a chunk never
+    sits in memory. Once the last byte arrives the SHA-256 is checked; on
+    a mismatch the received data is dropped and the client starts over.
+    """
+    if upload.complete:
+        raise UploadError("Загрузка уже завершена", 409)
+    start, length = parse_range(content_range, upload)
+    received = 0
+    with open(upload.path, "r+b") as file:
+        file.seek(start)
+        while received < length:
+            block = stream.read(min(BUFFER_SIZE, length - received))
+            if not block:
+                break
+            file.write(block)
+            received += len(block)
+        file.truncate(start + received)
+    if received != length:
+        raise UploadError("Фрагмент получен не полностью")
+    offset = start + length
+    complete = offset == upload.size
+    if complete and checksum(upload.path) != upload.sha256:
+        open(upload.path, "wb").close()
+        offset, complete = 0, False
+        error = UploadError("Контрольная сумма не совпала", 422)
+    else:
+        error = None
+    with serialized_write():
+        # Guards against two requests writing the same range at once.
+        updated = Upload.objects.filter(pk=upload.pk, offset=start).update(
+            offset=offset, complete=complete
+        )
+    if not updated:
+        raise UploadError("Фрагмент уже записан другим запросом", 409)
+    if error is not None:
+        raise error
+    upload.offset, upload.complete = offset, complete
+    return upload
+
+
+def finished_file(user, upload_id):
+    """The completed upload as an ``UploadedFile`` for a form."""
+    try:
+        upload = Upload.objects.filter(
+            pk=upload_id, user=user, complete=True
+        ).first()
+    except ValidationError:
+        upload = None
+    if upload is None:
+        raise Http404("Загрузка не найдена или не завершена")
+    file = UploadedFile(
+        open(upload.path, "rb"), upload.filename, size=upload.size
+    )
+    file.upload = upload
+    return file
+
+
+def discard(upload):
+    path = upload.path
+    with serialized_write():
+        upload.delete()
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def purge():
+    """Remove uploads abandoned for longer than ``UPLOAD_EXPIRY``."""
+    expired = Upload.objects.filter(
+        pub_date__lt=timezone.now() - timedelta(
+            seconds=settings.UPLOAD_EXPIRY
+        )
+    )
+    removed = 0
+    for upload in expired.iterator():
+        discard(upload)
+        removed += 1
+    return removed
@@ -1,4 +1,13 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+from django.views.decorators.http import require_http_methods, require_POST
+
+from . import uploads
+from .metrics import registry
+from .models import Upload
 
 
 def page_not_found(request, exception):
@@ -15,3 +24,63 @@ def server_error(request):
 
 def permission_denied(request, exception):
     return render(request, 'core/403.html', status=403)
+
+
+def metrics(request):
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(
+        registry.export(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+def upload_state(upload, status=200, error=None):
+    state = {
+        "id": str(upload.pk),
+        "url": reverse("upload", args=[upload.pk]),
+        "offset": upload.offset,
+        "size": upload.size,
+        "complete": upload.complete,
+    }
+    if error is not None:
+        state["error"] = str(error)
+    return JsonResponse(
+        state, status=status, json_dumps_params={"ensure_ascii": False}
+    )
+
+
+@login_required
+@require_POST
+def upload_create(request):
+    try:
+        upload = uploads.create(
+            request.user,
+            request.POST.get("filename"),
+            request.POST.get("size"),
+            request.POST.get("sha256"),
+        )
+    except uploads.UploadError as error:
+        return JsonResponse(
+            {"error": str(error)},
+            status=error.status,
+            json_dumps_params={"ensure_ascii": False},
+        )
+    return upload_state(upload, status=201)
+
+
+@login_required
+@require_http_methods(["GET", "PUT"])
+def upload_chunk(request, upload_id):
+    """Current offset on GET; PUT appends the ``Content-Range`` bytes."""
+    upload = get_object_or_404(Upload, pk=upload_id, user=request.user)
+    if request.method == "PUT":
+        try:
+            uploads.write_chunk(
+                upload, request, request.META.get("HTTP_CONTENT_RANGE")
+            )
+        except uploads.UploadError as error:
+            # The client resumes from the offset in the response.
+            upload.refresh_from_db()
+            return upload_state(upload, status=error.status, error=error)
+    return upload_state(upload)
@@ -1,10 +1,19 @@
 from django.contrib import admin
 
 from .models import Comment, Follow, Group, Post
+from .search import get_backend
+
+
+class FullTextSearchMixin:
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        ids = get_backend().matching_ids(self.model, search_term)
+        return queryset.filter(pk__in=ids), False
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ("pk", "text", "pub_date", "author", "group")
     list_editable = ("group",)
     search_fields = ("text",)
@@ -13,7 +22,7 @@ class PostAdmin(admin.ModelAdmin):
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ("pk", "text", "pub_date", "author", "post")
     list_editable = ("post",)
     search_fields = ("text",)
@@ -0,0 +1,80 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, Follow, Post, User, UserCounters
+
+COUNTED = {
+    "post_count": (Post, "author"),
+    "comment_count": (Comment, "author"),
+    "follower_count": (Follow, "author"),
+    "following_count": (Follow, "user"),
+}
+
+
+def bump(user_id, field, delta):
+    # A counter that drifted to zero must not fail the delete that
+    # decrements it; ``rebuild_counters`` restores the exact value.
+    UserCounters.objects.filter(user_id=user_id).update(
+        **{field: Greatest(F(field) + delta, 0)}
+    )
+
+
+def annotate_counts(users):
+    annotations = {}
+    for field, (model, owner) in COUNTED.items():
+        totals = model.objects.filter(
+            **{owner: OuterRef("pk")}
+        ).order_by().values(owner).annotate(total=Count("pk")).values("total")
+        annotations[f"actual_{field}"] = Coalesce(Subquery(totals), 0)
+    return users.annotate(**annotations)
+
+
+def rebuild(users=None, batch_size=500):
+    """Recalculate counters and return how many rows were fixed."""
+    if users is None:
+        users = User.objects.all()
+    users = annotate_counts(users.select_related("counters"))
+    missing, drifted = [], []
+    for user in users.iterator(chunk_size=batch_size):
+        actual = {
+            field: getattr(user, f"actual_{field}") for field in COUNTED
+        }
+        try:
+            counters = user.counters
+        except UserCounters.DoesNotExist:
+            missing.append(UserCounters(user=user, **actual))
+            continue
+        if any(getattr(counters, f) != v for f, v in actual.items()):
+            for field, value in actual.items():
+                setattr(counters, field, value)
+            drifted.append(counters)
+    UserCounters.objects.bulk_create(missing, batch_size=batch_size)
+    UserCounters.objects.bulk_update(
+        drifted, list(COUNTED), batch_size=batch_size
+    )
+    return len(missing) + len(drifted)
+
+
+def rebuild_comment_counts():
+    """Recalculate ``Post.comment_count`` in one statement."""
+    totals = Comment.objects.filter(
+        post=OuterRef("pk")
+    ).order_by().values("post").annotate(total=Count("pk")).values("total")
+    return Post.objects.exclude(
+        comment_count=Coalesce(Subquery(totals), 0)
+    ).update(comment_count=Coalesce(Subquery(totals), 0))
+
+
+def bump_comments(post_id, delta):
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F("comment_count") + delta, 0)
+    )
+
+
+def counters_for(user):
+    try:
+        return user.counters
+    except UserCounters.DoesNotExist:
+        rebuild(User.objects.filter(pk=user.pk))
+        user.counters = UserCounters.objects.get(user=user)
+        return user.counters
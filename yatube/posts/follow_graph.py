@@ -0,0 +1,83 @@
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import bump_generation, generation_key, get_generations
+
+from .models import Follow, UserCounters
+
+SCOPE = ("follow_graph",)
+# Unsigned 32-bit ids: four bytes per followed author.
+TYPECODE = "I"
+
+
+def following_key(user_id):
+    return f"follow_graph:following:{user_id}"
+
+
+def followers_key(author_id):
+    return f"follow_graph:followers:{author_id}"
+
+
+def _cached(key, load):
+    """Value stored under ``key`` for the current graph generation.
+
+    Entries remember the generation they were built in, so a bulk import
+    drops all of them with one ``bump_generation`` and a lookup costs a
+    single ``get_many``.
+    """
+    found = cache.get_many([generation_key(*SCOPE), key])
+    generation = found.get(generation_key(*SCOPE))
+    entry = found.get(key)
+    if generation is None:
+        generation, = get_generations(SCOPE)
+    if entry is not None and entry[0] == generation:
+        return entry[1]
+    value = load()
+    cache.set(key, (generation, value), settings.FOLLOW_GRAPH_TIMEOUT)
+    return value
+
+
+def following_ids(user_id):
+    """Sorted ids of the authors ``user_id`` follows."""
+    ids = array(TYPECODE)
+    if user_id is None:
+        return ids
+    ids.frombytes(_cached(
+        following_key(user_id),
+        lambda: array(TYPECODE, Follow.objects.filter(
+            user_id=user_id
+        ).order_by("author_id").values_list("author_id", flat=True)).tobytes()
+    ))
+    return ids
+
+
+def is_following(user_id, author_id):
+    ids = following_ids(user_id)
+    index = bisect_left(ids, author_id)
+    return index < len(ids) and ids[index] == author_id
+
+
+def follower_count(author_id):
+    return _cached(
+        followers_key(author_id),
+        lambda: UserCounters.objects.filter(user_id=author_id).values_list(
+            "follower_count", flat=True
+        ).first() or 0
+    )
+
+
+def forget_follow(user_id, author_id):
+    """Drop the entries a follow or unfollow changed.
+
+    Signals call this once the write commits; the next read reloads the
+    entries, so concurrent requests never patch over each other.
+    """
+    cache.delete_many([following_key(user_id), followers_key(author_id)])
+
+
+def forget_all():
+    """Drop every cached set after writes that bypass the signals."""
+    bump_generation(*SCOPE)
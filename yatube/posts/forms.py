@@ -1,5 +1,7 @@
 from django import forms
+from django.core.files.uploadedfile import UploadedFile
 
+from . import images
 from .models import Comment, Post
 
 
@@ -8,6 +10,29 @@ class PostForm(forms.ModelForm):
         model = Post
         fields = ('text', 'group', 'image')
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        if isinstance(image, UploadedFile):
+            self.prepared_image = images.prepare(image)
+            return self.prepared_image.original
+        return image
+
+    @property
+    def changed_fields(self):
+        """Model fields to save, including those derived from the image."""
+        if 'image' not in self.changed_data:
+            return self.changed_data
+        return self.changed_data + list(images.DERIVED_FIELDS)
+
+    def save(self, commit=True):
+        post = super().save(commit=False)
+        if 'image' in self.changed_data:
+            images.attach(post, getattr(self, 'prepared_image', None))
+        if commit:
+            post.save()
+            self._save_m2m()
+        return post
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,120 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+
+from .thumbnails import FEED_GEOMETRY
+
+FEED_SIZE = tuple(int(side) for side in FEED_GEOMETRY.split("x"))
+VARIANT_FIELDS = ("image_jpeg", "image_webp")
+# Post fields derived from ``Post.image``.
+DERIVED_FIELDS = ("image_width", "image_height") + VARIANT_FIELDS
+
+
+class PreparedImage:
+    def __init__(self, original, width, height, variants):
+        self.original = original
+        self.width = width
+        self.height = height
+        self.variants = variants
+
+
+def encode(image, image_format, name, **options):
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+def has_alpha(image):
+    return image.mode in ("RGBA", "LA") or (
+        image.mode == "P" and "transparency" in image.info
+    )
+
+
+def flatten(image):
+    """RGB copy of ``image`` with transparency laid over white."""
+    if not has_alpha(image):
+        return image.convert("RGB")
+    background = Image.new("RGBA", image.size, "white")
+    return Image.alpha_composite(background, image.convert("RGBA")).convert(
+        "RGB"
+    )
+
+
+def load(file):
+    """Decode ``file`` upright and no larger than ``IMAGE_MAX_SIZE``."""
+    max_size = settings.IMAGE_MAX_SIZE
+    file.seek(0)
+    with Image.open(file) as source:
+        # JPEG can decode straight at a reduced scale, far cheaper than
+        # decoding every pixel and resizing afterwards.
+        source.draft("RGB", (max_size, max_size))
+        image = ImageOps.exif_transpose(source)
+    image.thumbnail((max_size, max_size), Image.LANCZOS)
+    return image
+
+
+def feed_variants(image, stem):
+    """JPEG and, when Pillow supports it, WebP at the feed geometry."""
+    feed = ImageOps.fit(flatten(image), FEED_SIZE, Image.LANCZOS)
+    variants = {
+        "image_jpeg": encode(
+            feed, "JPEG", f"{stem}.jpg",
+            quality=settings.IMAGE_QUALITY, optimize=True, progressive=True,
+        ),
+    }
+    # WebP is optional in Pillow builds; browsers fall back to the JPEG.
+    if features.check("webp"):
+        variants["image_webp"] = encode(
+            feed, "WEBP", f"{stem}.webp", quality=settings.IMAGE_QUALITY
+        )
+    return variants
+
+
+def prepare(upload):
+    """Normalize an uploaded image and render the feed variants.
+
+    The original is rotated according to its EXIF orientation, shrunk and
+    re-encoded without metadata. The variants match the ``{% thumbnail %}``
+    geometry, so pages never decode the original.
+    """
+    stem = os.path.splitext(os.path.basename(upload.name))[0]
+    image = load(upload)
+    if has_alpha(image):
+        original = encode(
+            image.convert("RGBA"), "PNG", f"{stem}.png", optimize=True
+        )
+    else:
+        original = encode(
+            image.convert("RGB"), "JPEG", f"{stem}.jpg",
+            quality=settings.IMAGE_QUALITY, optimize=True, progressive=True,
+        )
+    return PreparedImage(
+        original, image.width, image.height, feed_variants(image, stem)
+    )
+
+
+def attach(post, prepared):
+    """Fill the fields derived from ``prepared``; ``None`` clears them."""
+    for field in VARIANT_FIELDS:
+        getattr(post, field).delete(save=False)
+    if prepared is None:
+        post.image_width = post.image_height = None
+        return
+    post.image_width = prepared.width
+    post.image_height = prepared.height
+    for field, content in prepared.variants.items():
+        getattr(post, field).save(content.name, content, save=False)
+
+
+def build_variants(post):
+    """Derive the fields for an image uploaded before normalization."""
+    with post.image.open("rb") as file:
+        image = load(file)
+    stem = os.path.splitext(os.path.basename(post.image.name))[0]
+    attach(post, PreparedImage(
+        None, image.width, image.height, feed_variants(image, stem)
+    ))
+    post.save(update_fields=DERIVED_FIELDS)
@@ -0,0 +1,24 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from posts.images import build_variants
+from posts.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Создаёт картинки для ленты у постов, загруженных ранее"
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image="").filter(image_jpeg="")
+        done = 0
+        for post in posts.iterator():
+            try:
+                build_variants(post)
+            except (OSError, ValueError):
+                logger.exception("Не удалось обработать %s", post.image)
+                continue
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f"Обработано картинок: {done}"))
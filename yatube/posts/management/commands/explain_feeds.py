@@ -0,0 +1,82 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from posts.models import Comment, Follow, Group, Post, User
+
+from yatube.settings import COMMENTS_QUANTITY, QUANTITY
+
+FEED_INDEXES = {
+    Post: ("post_pub_date", "post_author_pub_date", "post_group_pub_date"),
+    Comment: ("comment_post_pub_date",),
+}
+
+
+def first_pk(model):
+    return model.objects.order_by("pk").values_list("pk", flat=True).first()
+
+
+def feed_queries():
+    feed = Post.objects.for_feed().order_by("-pub_date", "-pk")
+    page = slice(0, QUANTITY + 1)
+    follower = Follow.objects.values_list("user", flat=True).first()
+    return {
+        "index": feed[page],
+        "group_posts": feed.filter(group_id=first_pk(Group))[page],
+        "profile": feed.filter(author_id=first_pk(User))[page],
+        "follow_index": feed.filter(author__following__user=follower)[page],
+        "post_detail": Comment.objects.filter(
+            post_id=first_pk(Post)
+        ).select_related("author").order_by(
+            "-pub_date", "-pk"
+        )[:COMMENTS_QUANTITY + 1],
+    }
+
+
+class Command(BaseCommand):
+    help = "Показывает планы и время запросов лент с индексами и без них"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Также показать планы без составных индексов",
+        )
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            with transaction.atomic():
+                self.drop_feed_indexes()
+                self.report("Без составных индексов", options["repeat"])
+                transaction.set_rollback(True)
+        self.report("С составными индексами", options["repeat"])
+
+    def drop_feed_indexes(self):
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, names in FEED_INDEXES.items():
+                for index in model._meta.indexes:
+                    if index.name in names:
+                        cursor.execute(str(index.remove_sql(model, editor)))
+
+    def report(self, title, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        explain = (
+            "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite"
+            else "EXPLAIN "
+        )
+        with connection.cursor() as cursor:
+            for name, queryset in feed_queries().items():
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(explain + sql, params)
+                plan = [str(row[-1]) for row in cursor.fetchall()]
+                started = perf_counter()
+                for _ in range(repeat):
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                elapsed = (perf_counter() - started) / repeat * 1000
+                self.stdout.write(f"  {name}: {elapsed:.3f} мс")
+                for line in plan:
+                    self.stdout.write(f"    {line}")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from posts.sitedata import export_site, open_dump
+
+
+class Command(BaseCommand):
+    help = (
+        "Выгружает пользователей, группы, посты, комментарии и подписки "
+        "в NDJSON (сжимается gzip, если путь оканчивается на .gz)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        with open_dump(options["path"], "w") as stream:
+            totals = export_site(stream, batch_size=options["batch_size"])
+        for label, total in totals.items():
+            self.stdout.write(f"{label}: {total}")
+        self.stdout.write(self.style.SUCCESS("Выгрузка завершена"))
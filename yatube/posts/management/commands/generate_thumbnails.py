@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.thumbnails import generate_all
+
+
+class Command(BaseCommand):
+    help = "Заранее создаёт миниатюры для всех картинок постов"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+
+    def handle(self, *args, **options):
+        names = Post.objects.exclude(image="").values_list(
+            "image", flat=True
+        ).iterator()
+        done = generate_all(names, options["workers"])
+        self.stdout.write(self.style.SUCCESS(f"Создано миниатюр: {done}"))
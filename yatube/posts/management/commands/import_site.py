@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.sitedata import SiteDataError, import_site, open_dump
+
+
+class Command(BaseCommand):
+    help = "Загружает выгрузку export_site пакетами в пустую базу"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            with open_dump(options["path"], "r") as stream:
+                totals = import_site(stream, batch_size=options["batch_size"])
+        except (OSError, SiteDataError) as error:
+            raise CommandError(error)
+        for label, total in totals.items():
+            self.stdout.write(f"{label}: {total}")
+        self.stdout.write(self.style.SUCCESS("Загрузка завершена"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from posts import follow_graph
+from posts.counters import rebuild, rebuild_comment_counts
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает счётчики постов, комментариев и подписок"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        fixed = rebuild(batch_size=options["batch_size"])
+        # Cached follower counts and follow sets may predate the rebuild.
+        follow_graph.forget_all()
+        self.stdout.write(self.style.SUCCESS(f"Исправлено счётчиков: {fixed}"))
+        fixed = rebuild_comment_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Исправлено счётчиков комментариев: {fixed}"
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import User
+from posts.timeline import rebuild
+
+
+class Command(BaseCommand):
+    help = "Пересобирает материализованные ленты подписок"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "usernames",
+            nargs="*",
+            help="Чьи ленты пересобрать (по умолчанию все)",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(follower__isnull=False).distinct()
+        if options["usernames"]:
+            users = users.filter(username__in=options["usernames"])
+        total = 0
+        for user in users.iterator():
+            rebuild(user)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"Пересобрано лент: {total}"))
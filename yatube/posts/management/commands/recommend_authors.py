@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.jobs import schedule
+from posts.recommendations import rebuild, refresh_recommendations
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает рекомендации авторов для подписчиков"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Поставить периодический пересчёт в очередь runworker",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            schedule(refresh_recommendations, 0)
+            self.stdout.write(self.style.SUCCESS(
+                "Пересчёт рекомендаций поставлен в очередь"
+            ))
+            return
+        saved = rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Сохранено рекомендаций: {saved}"
+        ))
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE posts_search USING fts5("
+    "text, post_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')",
+    "INSERT INTO posts_search (rowid, text, post_id) "
+    "SELECT id * 2, text, id FROM posts_post",
+    "INSERT INTO posts_search (rowid, text, post_id) "
+    "SELECT id * 2 + 1, text, post_id FROM posts_comment",
+)
+SQLITE_DROP = ("DROP TABLE IF EXISTS posts_search",)
+POSTGRES_CREATE = tuple(
+    f"CREATE INDEX {table}_text_search ON {table} USING gin "
+    f"(to_tsvector('russian'::regconfig, COALESCE(text, '')))"
+    for table in ("posts_post", "posts_comment")
+)
+POSTGRES_DROP = tuple(
+    f"DROP INDEX IF EXISTS {table}_text_search"
+    for table in ("posts_post", "posts_comment")
+)
+
+
+def run_for_vendor(sqlite, postgresql):
+    def run(apps, schema_editor):
+        statements = {
+            'sqlite': sqlite,
+            'postgresql': postgresql,
+        }.get(schema_editor.connection.vendor, ())
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(SQLITE_CREATE, POSTGRES_CREATE),
+            run_for_vendor(SQLITE_DROP, POSTGRES_DROP),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_recommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Высота картинки'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_jpeg',
+            field=models.FileField(blank=True, editable=False, upload_to='posts/feed/', verbose_name='Картинка для ленты (JPEG)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_webp',
+            field=models.FileField(blank=True, editable=False, upload_to='posts/feed/', verbose_name='Картинка для ленты (WebP)'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True, verbose_name='Ширина картинки'),
+        ),
+    ]
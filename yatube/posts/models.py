@@ -18,6 +18,11 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        return self.select_related("author", "group")
+
+
 class Post(CreatedModel):
     text = models.TextField(
         "Текст поста",
@@ -42,10 +47,46 @@ class Post(CreatedModel):
         upload_to='posts/',
         blank=True
     )
+    image_width = models.PositiveIntegerField(
+        "Ширина картинки", blank=True, null=True, editable=False
+    )
+    image_height = models.PositiveIntegerField(
+        "Высота картинки", blank=True, null=True, editable=False
+    )
+    image_jpeg = models.FileField(
+        "Картинка для ленты (JPEG)",
+        upload_to="posts/feed/",
+        blank=True,
+        editable=False,
+    )
+    image_webp = models.FileField(
+        "Картинка для ленты (WebP)",
+        upload_to="posts/feed/",
+        blank=True,
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        "Комментариев",
+        default=0,
+        editable=False,
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name_plural = "Посты"
         ordering = ("-pub_date",)
+        indexes = [
+            models.Index(name="post_pub_date", fields=["-pub_date", "-id"]),
+            models.Index(
+                name="post_author_pub_date",
+                fields=["author", "-pub_date", "-id"],
+            ),
+            models.Index(
+                name="post_group_pub_date",
+                fields=["group", "-pub_date", "-id"],
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.text[:15]
@@ -75,6 +116,12 @@ class Comment(CreatedModel):
     class Meta:
         verbose_name = "комментарий"
         verbose_name_plural = "Комментарии"
+        indexes = [
+            models.Index(
+                name="comment_post_pub_date",
+                fields=["post", "-pub_date", "-id"],
+            ),
+        ]
 
 
 class Follow(models.Model):
@@ -104,3 +151,89 @@ class Follow(models.Model):
                 check=~models.Q(user=models.F("author")),
             ),
         ]
+
+
+class TimelineEntry(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="timeline",
+        verbose_name="Читатель",
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+        verbose_name="Пост",
+    )
+    pub_date = models.DateTimeField("Дата публикации")
+
+    class Meta:
+        verbose_name = "запись ленты"
+        verbose_name_plural = "Ленты подписок"
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_timeline_post",
+                fields=["user", "post"],
+            ),
+        ]
+        indexes = [
+            models.Index(
+                name="timeline_user_pub_date",
+                fields=["user", "-pub_date"],
+            ),
+        ]
+
+
+class UserCounters(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="counters",
+        verbose_name="Пользователь",
+    )
+    post_count = models.PositiveIntegerField("Постов", default=0)
+    comment_count = models.PositiveIntegerField("Комментариев", default=0)
+    follower_count = models.PositiveIntegerField("Подписчиков", default=0)
+    following_count = models.PositiveIntegerField("Подписок", default=0)
+
+    class Meta:
+        verbose_name = "счётчики пользователя"
+        verbose_name_plural = "Счётчики пользователей"
+
+    def __str__(self) -> str:
+        return str(self.user)
+
+
+class Recommendation(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="recommendations",
+        verbose_name="Читатель",
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="recommended_to",
+        verbose_name="Автор",
+    )
+    score = models.PositiveIntegerField("Вес")
+    computed = models.DateTimeField("Рассчитано")
+
+    class Meta:
+        verbose_name = "рекомендация"
+        verbose_name_plural = "Рекомендации авторов"
+        constraints = [
+            models.UniqueConstraint(
+                name="unique_recommendation",
+                fields=["user", "author"],
+            ),
+        ]
+        indexes = [
+            models.Index(
+                name="recommendation_user_score",
+                fields=["user", "-score"],
+            ),
+        ]
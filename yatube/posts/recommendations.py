@@ -0,0 +1,155 @@
+from array import array
+from collections import defaultdict
+from heapq import nlargest
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.cache import bump_generation
+from core.db import serialized_write
+from core.jobs import schedule, task
+
+from .follow_graph import following_ids
+from .models import Follow, Recommendation
+
+# Unsigned 32-bit ids and counts, as in follow_graph.
+TYPECODE = "I"
+
+
+def load_graph(batch_size=5000):
+    """Follow edges as sorted id arrays in both directions."""
+    following = defaultdict(lambda: array(TYPECODE))
+    followers = defaultdict(lambda: array(TYPECODE))
+    edges = Follow.objects.order_by("user_id", "author_id").values_list(
+        "user_id", "author_id"
+    ).iterator(chunk_size=batch_size)
+    for user_id, author_id in edges:
+        following[user_id].append(author_id)
+        followers[author_id].append(user_id)
+    return following, followers
+
+
+class Accumulator:
+    """Sparse sums over a dense counter array indexed by user id.
+
+    Only touched slots are read back and reset, so each row costs time
+    proportional to its non-zeros rather than to the number of users.
+    """
+
+    def __init__(self, size):
+        self.counts = array(TYPECODE, bytes(4 * size))
+        self.touched = []
+
+    def add(self, ids):
+        self.add_weighted((pk, 1) for pk in ids)
+
+    def add_weighted(self, pairs):
+        counts, touched = self.counts, self.touched
+        for pk, weight in pairs:
+            if not counts[pk]:
+                touched.append(pk)
+            counts[pk] += weight
+
+    def top(self, limit, exclude=()):
+        counts = self.counts
+        best = nlargest(
+            limit,
+            (pk for pk in self.touched if pk not in exclude),
+            key=lambda pk: (counts[pk], -pk),
+        )
+        result = [(pk, counts[pk]) for pk in best]
+        for pk in self.touched:
+            counts[pk] = 0
+        self.touched = []
+        return result
+
+
+def similar_authors(following, followers, size):
+    """For each author, the authors most often followed by the same users.
+
+    Users following more than ``RECOMMENDATIONS_MAX_FOLLOWING`` authors
+    are skipped: they add quadratic work and carry little signal.
+    """
+    limit = settings.RECOMMENDATIONS_NEIGHBOURS
+    max_following = settings.RECOMMENDATIONS_MAX_FOLLOWING
+    accumulator = Accumulator(size)
+    similar = {}
+    for author_id, users in followers.items():
+        for user_id in users:
+            if len(following[user_id]) <= max_following:
+                accumulator.add(following[user_id])
+        similar[author_id] = accumulator.top(limit, exclude={author_id})
+    return similar
+
+
+def compute():
+    """Yield ``(user_id, [(author_id, score), ...])`` for every follower."""
+    following, followers = load_graph()
+    if not following:
+        return
+    size = max(max(following), max(followers)) + 1
+    similar = similar_authors(following, followers, size)
+    accumulator = Accumulator(size)
+    for user_id, authors in following.items():
+        for author_id in authors:
+            accumulator.add_weighted(similar[author_id])
+        yield user_id, accumulator.top(
+            settings.RECOMMENDATIONS_PER_USER,
+            exclude=set(authors) | {user_id},
+        )
+
+
+def rebuild(batch_size=500):
+    """Replace the stored recommendations and return how many were saved."""
+    computed = timezone.now()
+    saved, users, rows = 0, [], []
+
+    def flush():
+        with serialized_write():
+            Recommendation.objects.filter(user_id__in=users).delete()
+            Recommendation.objects.bulk_create(rows)
+
+    for user_id, authors in compute():
+        users.append(user_id)
+        rows += [
+            Recommendation(
+                user_id=user_id,
+                author_id=author_id,
+                score=score,
+                computed=computed,
+            )
+            for author_id, score in authors
+        ]
+        if len(users) >= batch_size:
+            flush()
+            saved += len(rows)
+            users, rows = [], []
+    flush()
+    saved += len(rows)
+    with serialized_write():
+        # Users who no longer follow anyone keep no suggestions.
+        Recommendation.objects.filter(computed__lt=computed).delete()
+    bump_generation("recommendations")
+    return saved
+
+
+@task
+def refresh_recommendations():
+    rebuild()
+    schedule(refresh_recommendations, settings.RECOMMENDATIONS_INTERVAL)
+
+
+def recommended_authors(user):
+    """Suggested authors for ``user`` that they do not follow yet."""
+    if not user.is_authenticated:
+        return []
+    rows = list(Recommendation.objects.filter(user=user).select_related(
+        "author"
+    ).order_by("-score", "author_id")[:settings.RECOMMENDATIONS_PER_USER])
+    if not rows:
+        return []
+    # Follows made since the last rebuild come from the cached graph.
+    followed = set(following_ids(user.pk))
+    return [
+        row.author for row in rows if row.author_id not in followed
+    ][:settings.RECOMMENDATIONS_SHOWN]
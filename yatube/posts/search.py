@@ -0,0 +1,206 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+
+from core.pagination import InvalidCursor, decode_token, encode_token
+
+from .models import Comment, Post
+
+TABLE = "posts_search"
+# Posts and comments share one FTS table: rowid = pk * 2 + kind.
+KINDS = {Post: 0, Comment: 1}
+
+
+class SearchPage:
+    def __init__(self, object_list, number, next_cursor):
+        self.object_list = object_list
+        self.number = number
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def search_post_id(obj):
+    return obj.pk if isinstance(obj, Post) else obj.post_id
+
+
+class SQLiteSearch:
+    def match(self, query):
+        words = re.findall(r"\w+", query.lower())
+        return " ".join(f'"{word}"*' for word in words)
+
+    def index(self, obj):
+        rowid = obj.pk * 2 + KINDS[type(obj)]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [rowid])
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, text, post_id) "
+                "VALUES (%s, %s, %s)",
+                [rowid, obj.text, search_post_id(obj)],
+            )
+
+    def remove(self, obj):
+        rowid = obj.pk * 2 + KINDS[type(obj)]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [rowid])
+
+    def rebuild(self, batch_size=1000):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+            for model, kind in KINDS.items():
+                rows = model.objects.values_list(
+                    "pk", "text", "post_id" if model is Comment else "pk"
+                ).order_by().iterator(chunk_size=batch_size)
+                batch = []
+                for pk, text, post_id in rows:
+                    batch.append([pk * 2 + kind, text, post_id])
+                    if len(batch) >= batch_size:
+                        self.insert_many(cursor, batch)
+                        batch = []
+                self.insert_many(cursor, batch)
+            cursor.execute(
+                f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')"
+            )
+
+    def insert_many(self, cursor, rows):
+        if rows:
+            cursor.executemany(
+                f"INSERT INTO {TABLE} (rowid, text, post_id) "
+                "VALUES (%s, %s, %s)",
+                rows,
+            )
+
+    def ranked_post_ids(self, query, after, limit):
+        match = self.match(query)
+        if not match:
+            # FTS5 rejects an empty MATCH, e.g. for "!!!".
+            return []
+        having, params = "", [match]
+        if after is not None:
+            having = "HAVING score > %s OR (score = %s AND post_id > %s)"
+            params += [after[0], after[0], after[1]]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT post_id, MIN(hit_rank) AS score FROM ("
+                f"SELECT CAST(post_id AS INTEGER) AS post_id, "
+                f"rank AS hit_rank FROM {TABLE} WHERE {TABLE} MATCH %s"
+                f") GROUP BY post_id {having} "
+                f"ORDER BY score, post_id LIMIT %s",
+                params + [limit],
+            )
+            return cursor.fetchall()
+
+    def matching_ids(self, model, query):
+        match = self.match(query)
+        if not match:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {TABLE} WHERE {TABLE} MATCH %s "
+                "AND rowid %% 2 = %s",
+                [match, KINDS[model]],
+            )
+            return [rowid // 2 for rowid, in cursor.fetchall()]
+
+
+class DatabaseSearch:
+    """Searches the tables directly, nothing to keep in sync."""
+
+    def index(self, obj):
+        pass
+
+    def remove(self, obj):
+        pass
+
+    def rebuild(self, batch_size=1000):
+        pass
+
+    def documents(self, queryset):
+        return queryset
+
+    def matches(self, model, query):
+        return self.documents(model.objects.all()).filter(
+            self.condition(query)
+        )
+
+    def matching_ids(self, model, query):
+        return list(self.matches(model, query).values_list("pk", flat=True))
+
+    def ranked_post_ids(self, query, after, limit):
+        commented = self.matches(Comment, query).values("post_id")
+        posts = self.ranked(self.documents(Post.objects.all()), query)
+        posts = posts.filter(self.condition(query) | Q(pk__in=commented))
+        if after is not None:
+            posts = posts.filter(
+                Q(score__gt=after[0]) | Q(score=after[0], pk__gt=after[1])
+            )
+        return list(posts.order_by("score", "pk").values_list(
+            "pk", "score"
+        )[:limit])
+
+
+class PostgresSearch(DatabaseSearch):
+    config = "russian"
+
+    def vector(self):
+        from django.contrib.postgres.search import SearchVector
+        return SearchVector("text", config=self.config)
+
+    def search_query(self, query):
+        from django.contrib.postgres.search import SearchQuery
+        return SearchQuery(query, config=self.config)
+
+    def documents(self, queryset):
+        return queryset.annotate(document=self.vector())
+
+    def condition(self, query):
+        return Q(document=self.search_query(query))
+
+    def ranked(self, posts, query):
+        from django.contrib.postgres.search import SearchRank
+        return posts.annotate(
+            score=-SearchRank(self.vector(), self.search_query(query))
+        )
+
+
+class LikeSearch(DatabaseSearch):
+    def condition(self, query):
+        return Q(text__icontains=query)
+
+    def ranked(self, posts, query):
+        return posts.annotate(score=Value(0.0, output_field=FloatField()))
+
+
+def get_backend():
+    if connection.vendor == "sqlite":
+        return SQLiteSearch()
+    if connection.vendor == "postgresql":
+        return PostgresSearch()
+    return LikeSearch()
+
+
+def search_posts(query, cursor, per_page):
+    after, number = None, 1
+    if cursor:
+        try:
+            score, post_id, number = decode_token(cursor)
+            after, number = (float(score), int(post_id)), int(number)
+        except (InvalidCursor, TypeError, ValueError):
+            after, number = None, 1
+    if not query.strip():
+        return SearchPage([], 1, None)
+    ranked = get_backend().ranked_post_ids(query, after, per_page + 1)
+    next_cursor = None
+    if len(ranked) > per_page:
+        ranked = ranked[:per_page]
+        post_id, score = ranked[-1]
+        next_cursor = encode_token([score, post_id, number + 1])
+    posts = Post.objects.for_feed().in_bulk([pk for pk, _ in ranked])
+    return SearchPage(
+        [posts[pk] for pk, _ in ranked if pk in posts], number, next_cursor
+    )
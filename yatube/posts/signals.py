@@ -0,0 +1,155 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from core.jobs import enqueue
+
+from . import counters, follow_graph, search, timeline
+from .models import Comment, Follow, Group, Post, User, UserCounters
+
+COUNT_FIELDS = {
+    Post: "post_count",
+    Comment: "comment_count",
+}
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and timeline.timeline_enabled():
+        enqueue(timeline.fan_out_post, instance.pk)
+
+
+@receiver(post_save, sender=User)
+def create_counters(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        UserCounters.objects.get_or_create(user=instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def count_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.bump(instance.author_id, COUNT_FIELDS[sender], 1)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def count_deleted(sender, instance, **kwargs):
+    counters.bump(instance.author_id, COUNT_FIELDS[sender], -1)
+
+
+@receiver(post_save, sender=Comment)
+def count_post_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.bump_comments(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_post_comment(sender, instance, **kwargs):
+    counters.bump_comments(instance.post_id, -1)
+
+
+def forget_follow_on_commit(follow):
+    transaction.on_commit(lambda: follow_graph.forget_follow(
+        follow.user_id, follow.author_id
+    ))
+
+
+@receiver(post_save, sender=Follow)
+def count_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.bump(instance.author_id, "follower_count", 1)
+        counters.bump(instance.user_id, "following_count", 1)
+        forget_follow_on_commit(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def count_unfollow(sender, instance, **kwargs):
+    counters.bump(instance.author_id, "follower_count", -1)
+    counters.bump(instance.user_id, "following_count", -1)
+    forget_follow_on_commit(instance)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline(sender, instance, created, raw=False, **kwargs):
+    # Registered after ``count_follow``: the backfill reads the counter.
+    if created and not raw and timeline.timeline_enabled():
+        timeline.backfill(instance.user, instance.author)
+
+
+@receiver(post_delete, sender=Follow)
+def prune_timeline(sender, instance, **kwargs):
+    if timeline.timeline_enabled():
+        timeline.prune(instance.user, instance.author)
+        if timeline.left_celebrities(instance.author_id):
+            enqueue(timeline.backfill_followers, instance.author_id)
+
+
+@receiver(pre_save, sender=Post)
+def remember_group(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._previous_group_slug = Post.objects.filter(
+            pk=instance.pk
+        ).values_list("group__slug", flat=True).first()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_pages(sender, instance, **kwargs):
+    bump_generation("posts")
+    bump_generation("post", instance.pk)
+    bump_generation("profile", instance.author.username)
+    if kwargs.get("created", True):
+        # The author's post count is shown next to each of their posts.
+        bump_generation("author", instance.author_id)
+    slugs = {getattr(instance, "_previous_group_slug", None)}
+    if instance.group_id:
+        slugs.add(instance.group.slug)
+    for slug in slugs - {None}:
+        bump_generation("group", slug)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    bump_generation("post", instance.post_id)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_pages(sender, instance, **kwargs):
+    bump_generation("groups")
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_pages(sender, instance, created, update_fields=None,
+                            **kwargs):
+    # Logins save only last_login, which no page shows.
+    if created or update_fields and set(update_fields) <= {"last_login"}:
+        return
+    bump_generation("author", instance.pk)
+    bump_generation("profile", instance.username)
+    bump_generation("posts")
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def invalidate_follow_pages(sender, instance, **kwargs):
+    # Both profiles show counts: followers of one, follows of the other.
+    bump_generation("profile", instance.author.username)
+    bump_generation("profile", instance.user.username)
+    bump_generation("follows", instance.user_id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def index_text(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.get_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def unindex_text(sender, instance, **kwargs):
+    search.get_backend().remove(instance)
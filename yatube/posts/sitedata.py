@@ -0,0 +1,162 @@
+import gzip
+import json
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connection, transaction
+
+from core.cache import bump_generation
+
+from . import counters, follow_graph, timeline
+from .models import Comment, Follow, Group, Post, User
+from .search import get_backend
+
+FORMAT_VERSION = 1
+# Parents come before children, so every chunk only references rows that
+# were inserted earlier in the stream.
+SITE_MODELS = (User, Group, Post, Comment, Follow)
+MODELS_BY_LABEL = {model._meta.label_lower: model for model in SITE_MODELS}
+FIELDS_BY_MODEL = {
+    model: {
+        name
+        for field in model._meta.concrete_fields
+        for name in (field.name, field.attname)
+    }
+    for model in SITE_MODELS
+}
+
+
+class SiteDataError(Exception):
+    pass
+
+
+def open_dump(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def export_site(stream, batch_size=1000):
+    """Write the site as NDJSON, one object per line, in constant memory."""
+    stream.write(json.dumps({"format": FORMAT_VERSION}) + "\n")
+    totals = Counter()
+    for model in SITE_MODELS:
+        label = model._meta.label_lower
+        fields = [field.attname for field in model._meta.concrete_fields]
+        rows = model._base_manager.order_by("pk").values(*fields)
+        for row in rows.iterator(chunk_size=batch_size):
+            stream.write(json.dumps(
+                {"model": label, "fields": row},
+                cls=DjangoJSONEncoder,
+                ensure_ascii=False,
+            ) + "\n")
+            totals[label] += 1
+    return totals
+
+
+@contextmanager
+def original_dates():
+    """Let ``bulk_create`` keep imported ``auto_now_add`` values."""
+    fields = [
+        field
+        for model in SITE_MODELS
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_records(stream):
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise SiteDataError(f"Строка {number}: некорректный JSON")
+        if "format" in record:
+            if record["format"] != FORMAT_VERSION:
+                raise SiteDataError(
+                    f"Неподдерживаемая версия формата: {record['format']}"
+                )
+            continue
+        model = MODELS_BY_LABEL.get(record.get("model"))
+        if model is None:
+            raise SiteDataError(
+                f"Строка {number}: неизвестная модель {record.get('model')}"
+            )
+        fields = record.get("fields")
+        if not isinstance(fields, dict):
+            raise SiteDataError(f"Строка {number}: нет полей записи")
+        unknown = set(fields) - FIELDS_BY_MODEL[model]
+        if unknown:
+            raise SiteDataError(
+                f"Строка {number}: у {record['model']} нет полей "
+                f"{', '.join(sorted(unknown))}"
+            )
+        yield model, fields
+
+
+def import_site(stream, batch_size=1000):
+    """Load an ``export_site`` stream with chunked ``bulk_create``.
+
+    Signals do not fire for bulk inserts, so counters, the search index
+    and timelines are rebuilt once after all rows are in.
+    """
+    totals = Counter()
+    model, chunk = None, []
+
+    def flush():
+        if chunk:
+            # The backend picks the statement size; the chunk bounds memory.
+            model.objects.bulk_create(chunk)
+            totals[model._meta.label_lower] += len(chunk)
+            chunk.clear()
+
+    try:
+        with transaction.atomic(), original_dates():
+            for record_model, fields in read_records(stream):
+                if record_model is not model or len(chunk) >= batch_size:
+                    flush()
+                    model = record_model
+                chunk.append(model(**fields))
+            flush()
+            reset_sequences()
+            rebuild_derived(batch_size)
+    except IntegrityError as error:
+        raise SiteDataError(
+            f"Записи {model._meta.label_lower} конфликтуют с данными в базе, "
+            f"загружайте выгрузку в пустую базу: {error}"
+        )
+    return totals
+
+
+def reset_sequences():
+    statements = connection.ops.sequence_reset_sql(no_style(), SITE_MODELS)
+    if statements:
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def rebuild_derived(batch_size):
+    counters.rebuild(batch_size=batch_size)
+    counters.rebuild_comment_counts()
+    get_backend().rebuild(batch_size=batch_size)
+    if settings.TIMELINE_ENABLED:
+        for user in User.objects.filter(
+            follower__isnull=False
+        ).distinct().iterator():
+            timeline.rebuild(user)
+    follow_graph.forget_all()
+    bump_generation("posts")
+    bump_generation("groups")
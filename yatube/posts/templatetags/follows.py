@@ -0,0 +1,15 @@
+from django import template
+
+from posts import follow_graph
+
+register = template.Library()
+
+
+@register.filter
+def is_following(user, author):
+    return follow_graph.is_following(user.pk, author.pk)
+
+
+@register.filter
+def follower_count(author):
+    return follow_graph.follower_count(author.pk)
@@ -0,0 +1,9 @@
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+
+@register.simple_tag
+def card_cache_timeout():
+    return settings.CARD_CACHE_TIMEOUT
@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Follow, Group, Post, User
+
+USER_NAME = 'auth'
+USER_NAME_2 = 'man'
+USER_NAME_3 = 'another'
+INDEX_FOLLOW = reverse('posts:follow_index')
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(USER_NAME)
+        cls.reader = User.objects.create_user(USER_NAME_2)
+        cls.stranger = User.objects.create_user(USER_NAME_3)
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='test_slug', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            author=cls.author, group=cls.group, text='Исходный текст'
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+        cls.detail = reverse('posts:post_detail', args=[cls.post.pk])
+        cls.profile = reverse('posts:profile', args=[USER_NAME])
+
+    def setUp(self):
+        cache.clear()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+        self.stranger_client = Client()
+        self.stranger_client.force_login(self.stranger)
+
+    def test_card_shared_between_users(self):
+        self.author_client.get(self.detail)
+        Post.objects.update(text='Без сигнала')
+        for client in (self.author_client, self.reader_client):
+            with self.subTest(client=client):
+                self.assertContains(client.get(self.detail), 'Исходный текст')
+        self.assertContains(
+            self.reader_client.get(INDEX_FOLLOW), 'Без сигнала'
+        )
+
+    def test_card_invalidated_on_change(self):
+        self.reader_client.get(INDEX_FOLLOW)
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        self.assertContains(self.reader_client.get(INDEX_FOLLOW), post.text)
+        self.group.title = 'Новая группа'
+        self.group.save()
+        self.assertContains(
+            self.reader_client.get(INDEX_FOLLOW), 'Новая группа'
+        )
+        self.author.first_name = 'Лев'
+        self.author.save()
+        self.assertContains(self.reader_client.get(INDEX_FOLLOW), 'Лев')
+
+    def test_per_user_parts_not_cached(self):
+        self.author_client.get(self.detail)
+        response = self.reader_client.get(self.detail)
+        self.assertNotContains(response, 'редактировать запись')
+        response = self.author_client.get(self.detail)
+        self.assertContains(response, 'редактировать запись')
+
+    def test_follow_button_not_shared(self):
+        response = self.reader_client.get(self.profile)
+        self.assertContains(response, 'Отписаться')
+        response = self.stranger_client.get(self.profile)
+        self.assertContains(response, 'Подписаться')
+        self.assertNotContains(response, 'Отписаться')
+        response = self.reader_client.get(self.profile)
+        self.assertContains(response, 'Отписаться')
@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Comment, Post, User
+
+from yatube.settings import COMMENTS_QUANTITY
+
+USER_NAME = 'auth'
+
+
+class CommentPaginationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(USER_NAME)
+        cls.post = Post.objects.create(author=cls.user, text='Пост')
+        cls.quiet_post = Post.objects.create(author=cls.user, text='Тихий')
+        for number in range(COMMENTS_QUANTITY + 5):
+            Comment.objects.create(
+                post=cls.post, author=cls.user, text=f'Комментарий {number}'
+            )
+        Comment.objects.create(
+            post=cls.quiet_post, author=cls.user, text='Единственный'
+        )
+        cls.DETAIL = reverse('posts:post_detail', args=[cls.post.pk])
+        cls.COMMENTS = reverse('posts:post_comments', args=[cls.post.pk])
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_comment_count_follows_changes(self):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, COMMENTS_QUANTITY + 5)
+        self.authorized_client.post(
+            reverse('posts:add_comment', args=[self.quiet_post.pk]),
+            {'text': 'Новый'},
+        )
+        self.quiet_post.refresh_from_db()
+        self.assertEqual(self.quiet_post.comment_count, 2)
+        Comment.objects.filter(text='Новый').delete()
+        self.quiet_post.refresh_from_db()
+        self.assertEqual(self.quiet_post.comment_count, 1)
+
+    def test_drifted_comment_count_does_not_block_delete(self):
+        Post.objects.filter(pk=self.quiet_post.pk).update(comment_count=0)
+        Comment.objects.filter(post=self.quiet_post).delete()
+        self.quiet_post.refresh_from_db()
+        self.assertEqual(self.quiet_post.comment_count, 0)
+
+    def test_detail_shows_newest_page(self):
+        comments = self.client.get(self.DETAIL).context['comments']
+        self.assertEqual(len(comments), COMMENTS_QUANTITY)
+        self.assertEqual(
+            comments[0].text, f'Комментарий {COMMENTS_QUANTITY + 4}'
+        )
+        self.assertIsNotNone(comments.next_cursor)
+
+    def test_load_more_returns_older_comments(self):
+        cursor = self.client.get(self.DETAIL).context['comments'].next_cursor
+        response = self.client.get(self.COMMENTS, {'cursor': cursor})
+        self.assertTemplateUsed(response, 'posts/includes/comments.html')
+        self.assertContains(response, 'Комментарий 0')
+        self.assertNotContains(response, f'Комментарий {COMMENTS_QUANTITY}')
+        self.assertNotContains(response, 'data-load-more')
+        data = self.client.get(
+            self.COMMENTS, {'cursor': cursor, 'format': 'json'}
+        ).json()
+        self.assertEqual(len(data['results']), 5)
+        self.assertIsNone(data['next'])
+
+    def test_detail_cost_does_not_grow_with_thread(self):
+        costs = []
+        for post in (self.quiet_post, self.post):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(
+                    reverse('posts:post_detail', args=[post.pk])
+                )
+            costs.append(len(queries))
+        self.assertEqual(costs[0], costs[1])
+
+    def test_rebuild_counters_fixes_comment_count(self):
+        Post.objects.update(comment_count=0)
+        call_command('rebuild_counters', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, COMMENTS_QUANTITY + 5)
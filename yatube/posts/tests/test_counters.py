@@ -0,0 +1,75 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post, User, UserCounters
+
+USER_NAME = 'auth'
+USER_NAME_2 = 'man'
+POST_CREATE = reverse('posts:post_create')
+FOLLOW = reverse('posts:profile_follow', args=[USER_NAME])
+UNFOLLOW = reverse('posts:profile_unfollow', args=[USER_NAME])
+
+
+class CountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(USER_NAME)
+        cls.follower = User.objects.create_user(USER_NAME_2)
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+
+    def counters(self, user):
+        return UserCounters.objects.get(user=user)
+
+    def test_post_and_comment_counters(self):
+        self.author_client.post(POST_CREATE, {'text': 'Новый пост'})
+        post = Post.objects.get()
+        self.follower_client.post(
+            reverse('posts:add_comment', args=[post.id]),
+            {'text': 'Комментарий'},
+        )
+        self.assertEqual(self.counters(self.author).post_count, 1)
+        self.assertEqual(self.counters(self.follower).comment_count, 1)
+        post.delete()
+        self.assertEqual(self.counters(self.author).post_count, 0)
+        self.assertEqual(self.counters(self.follower).comment_count, 0)
+
+    def test_follow_counters(self):
+        self.follower_client.get(FOLLOW)
+        self.assertEqual(self.counters(self.author).follower_count, 1)
+        self.assertEqual(self.counters(self.follower).following_count, 1)
+        self.follower_client.get(UNFOLLOW)
+        self.assertEqual(self.counters(self.author).follower_count, 0)
+        self.assertEqual(self.counters(self.follower).following_count, 0)
+
+    def test_rebuild_counters_fixes_drift(self):
+        Post.objects.bulk_create([
+            Post(author=self.author, text='Пост без сигнала'),
+        ])
+        UserCounters.objects.filter(user=self.follower).delete()
+        call_command('rebuild_counters', stdout=StringIO())
+        self.assertEqual(self.counters(self.author).post_count, 1)
+        self.assertTrue(
+            UserCounters.objects.filter(user=self.follower).exists()
+        )
+
+    def test_drifted_counter_does_not_block_delete(self):
+        post = Post.objects.create(author=self.author, text='Пост')
+        UserCounters.objects.filter(user=self.author).update(post_count=0)
+        post.delete()
+        self.assertEqual(self.counters(self.author).post_count, 0)
+
+    def test_profile_shows_post_count(self):
+        self.author_client.post(POST_CREATE, {'text': 'Новый пост'})
+        response = self.follower_client.get(
+            reverse('posts:profile', args=[USER_NAME])
+        )
+        self.assertEqual(response.context['author'].counters.post_count, 1)
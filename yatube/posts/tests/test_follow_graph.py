@@ -0,0 +1,106 @@
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+
+from .. import follow_graph
+from ..models import Follow, User
+
+USER_NAME = 'auth'
+USER_NAME_2 = 'man'
+USER_NAME_3 = 'other'
+PROFILE = reverse('posts:profile', args=[USER_NAME])
+FOLLOW = reverse('posts:profile_follow', args=[USER_NAME])
+UNFOLLOW = reverse('posts:profile_unfollow', args=[USER_NAME])
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(USER_NAME)
+        cls.follower = User.objects.create_user(USER_NAME_2)
+        cls.other = User.objects.create_user(USER_NAME_3)
+
+    def setUp(self):
+        cache.clear()
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+
+    def test_membership_is_served_from_cache(self):
+        Follow.objects.create(user=self.follower, author=self.other)
+        self.assertFalse(
+            follow_graph.is_following(self.follower.pk, self.author.pk)
+        )
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                follow_graph.is_following(self.follower.pk, self.other.pk)
+            )
+            self.assertEqual(
+                list(follow_graph.following_ids(self.follower.pk)),
+                [self.other.pk],
+            )
+
+    def test_forget_all_drops_stale_sets(self):
+        follow_graph.following_ids(self.follower.pk)
+        Follow.objects.bulk_create([
+            Follow(user=self.follower, author=self.author),
+        ])
+        self.assertFalse(
+            follow_graph.is_following(self.follower.pk, self.author.pk)
+        )
+        follow_graph.forget_all()
+        self.assertTrue(
+            follow_graph.is_following(self.follower.pk, self.author.pk)
+        )
+
+    def test_writes_ignore_stale_cache(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        follow_graph.following_ids(self.follower.pk)
+        # Inside TestCase the commit hook never runs: the cache is stale.
+        Follow.objects.all().delete()
+        self.follower_client.get(FOLLOW)
+        self.assertEqual(Follow.objects.count(), 1)
+        follow_graph.following_ids(self.follower.pk)
+        self.follower_client.get(UNFOLLOW)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_profile_shows_unfollow_button(self):
+        self.follower_client.get(FOLLOW)
+        response = self.follower_client.get(PROFILE)
+        self.assertTrue(response.context['following'])
+
+    def test_template_filters(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        rendered = Template(
+            '{% load follows %}{{ user|is_following:author }} '
+            '{{ author|follower_count }}'
+        ).render(Context({'user': self.follower, 'author': self.author}))
+        self.assertEqual(rendered, 'True 1')
+
+
+class FollowGraphCommitTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(USER_NAME)
+        self.follower = User.objects.create_user(USER_NAME_2)
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+
+    def test_commit_drops_cached_sets(self):
+        follow_graph.following_ids(self.follower.pk)
+        follow_graph.follower_count(self.author.pk)
+        self.follower_client.get(FOLLOW)
+        self.assertTrue(
+            follow_graph.is_following(self.follower.pk, self.author.pk)
+        )
+        self.assertEqual(follow_graph.follower_count(self.author.pk), 1)
+        with self.assertNumQueries(0):
+            self.assertTrue(
+                follow_graph.is_following(self.follower.pk, self.author.pk)
+            )
+        self.follower_client.get(UNFOLLOW)
+        self.assertFalse(
+            follow_graph.is_following(self.follower.pk, self.author.pk)
+        )
+        self.assertEqual(follow_graph.follower_count(self.author.pk), 0)
@@ -0,0 +1,99 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from ..models import Post, User
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+POST_CREATE = reverse('posts:post_create')
+INDEX = reverse('posts:index')
+# EXIF orientation tag; 6 means "rotate 90° clockwise to display".
+ORIENTATION = 0x0112
+
+
+def upload(name, size, mode='RGB', image_format='JPEG', orientation=None):
+    image = Image.new(mode, size, 'red')
+    buffer = BytesIO()
+    options = {}
+    if orientation is not None:
+        exif = Image.Exif()
+        exif[ORIENTATION] = orientation
+        options['exif'] = exif.tobytes()
+    image.save(buffer, image_format, **options)
+    return SimpleUploadedFile(
+        name, buffer.getvalue(), content_type=f'image/{image_format.lower()}'
+    )
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT, IMAGE_MAX_SIZE=100)
+class ImagePipelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user('auth')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def create(self, image):
+        self.client.post(POST_CREATE, {'text': 'Пост', 'image': image})
+        return Post.objects.latest('pk')
+
+    def test_upload_is_rotated_shrunk_and_stripped(self):
+        post = self.create(upload('photo.jpg', (300, 150), orientation=6))
+        self.assertEqual((post.image_width, post.image_height), (50, 100))
+        with Image.open(post.image.path) as original:
+            self.assertEqual(original.size, (50, 100))
+            self.assertEqual(original.format, 'JPEG')
+            self.assertFalse(original.getexif())
+
+    def test_transparent_upload_stays_png(self):
+        post = self.create(
+            upload('logo.png', (20, 20), mode='RGBA', image_format='PNG')
+        )
+        self.assertTrue(post.image.name.endswith('.png'))
+
+    def test_feed_variants_match_template_geometry(self):
+        post = self.create(upload('photo.jpg', (40, 30)))
+        with Image.open(post.image_jpeg.path) as variant:
+            self.assertEqual(variant.size, (960, 339))
+        response = self.client.get(INDEX)
+        self.assertContains(response, post.image_jpeg.url)
+
+    def test_edit_without_upload_keeps_variants(self):
+        post = self.create(upload('photo.jpg', (40, 30)))
+        self.client.post(
+            reverse('posts:post_edit', args=[post.pk]), {'text': 'Правка'}
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.text, 'Правка')
+        self.assertTrue(post.image_jpeg)
+
+    def test_build_image_variants_for_old_posts(self):
+        post = Post.objects.create(
+            author=self.user,
+            text='Старый пост',
+            image=upload('old.jpg', (300, 150)),
+        )
+        self.assertFalse(post.image_jpeg)
+        out = StringIO()
+        call_command('build_image_variants', stdout=out)
+        self.assertIn('1', out.getvalue())
+        post.refresh_from_db()
+        self.assertTrue(post.image_jpeg)
+        self.assertEqual((post.image_width, post.image_height), (100, 50))
@@ -0,0 +1,83 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Follow, Group, Post, User
+
+from yatube.settings import QUANTITY
+
+USER_NAME = 'auth'
+USER_NAME_2 = 'man'
+SLUG = 'test_slug'
+INDEX = reverse('posts:index')
+INDEX_FOLLOW = reverse('posts:follow_index')
+GROUP = reverse('posts:group_list', kwargs={'any_slug': SLUG})
+PROFILE = reverse('posts:profile', args=[USER_NAME])
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug=SLUG,
+            description='Тестовое описание',
+        )
+        cls.follower = User.objects.create_user(USER_NAME_2)
+        authors = [
+            User.objects.create_user(f'{USER_NAME}{i}')
+            for i in range(QUANTITY)
+        ]
+        authors[0].username = USER_NAME
+        authors[0].save()
+        cls.posts = [
+            Post.objects.create(
+                author=author,
+                group=cls.group,
+                text=f'Тестовая запись {i}',
+            )
+            for i, author in enumerate(authors)
+        ]
+        for author in authors:
+            Follow.objects.create(user=cls.follower, author=author)
+        for i, author in enumerate(authors):
+            Comment.objects.create(
+                author=author,
+                post=cls.posts[0],
+                text=f'Комментарий {i}',
+            )
+        cls.POST_DETAIL = reverse(
+            'posts:post_detail', args=[cls.posts[0].id]
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+
+    def test_feed_query_budget(self):
+        pages_budget = {
+            INDEX: 3,
+            GROUP: 4,
+            PROFILE: 5,
+            INDEX_FOLLOW: 4,
+            self.POST_DETAIL: 5,
+        }
+        for address, budget in pages_budget.items():
+            with self.subTest(address=address):
+                cache.clear()
+                with self.assertNumQueries(budget):
+                    self.follower_client.get(address)
+
+    def test_feeds_use_composite_indexes(self):
+        out = StringIO()
+        call_command('explain_feeds', '--compare', '--repeat=1', stdout=out)
+        with_indexes = out.getvalue().split('С составными индексами')[1]
+        for index in ('post_pub_date', 'post_author_pub_date',
+                      'post_group_pub_date', 'comment_post_pub_date'):
+            with self.subTest(index=index):
+                self.assertIn(index, with_indexes)
@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Job
+
+from ..follow_graph import forget_follow, following_ids
+from ..models import Follow, Recommendation, User
+from ..recommendations import compute, recommended_authors
+
+INDEX_FOLLOW = reverse('posts:follow_index')
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.first, cls.second, cls.third = (
+            User.objects.create_user(f'author_{i}') for i in range(3)
+        )
+        cls.reader, cls.fan, cls.newcomer = (
+            User.objects.create_user(name)
+            for name in ('reader', 'fan', 'newcomer')
+        )
+        for user, author in (
+            (cls.reader, cls.first),
+            (cls.reader, cls.second),
+            (cls.fan, cls.first),
+            (cls.fan, cls.second),
+            (cls.fan, cls.third),
+            (cls.newcomer, cls.first),
+        ):
+            Follow.objects.create(user=user, author=author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.newcomer)
+
+    def rebuild(self):
+        call_command('recommend_authors', stdout=StringIO())
+
+    def test_co_followed_authors_rank_first(self):
+        results = dict(compute())
+        self.assertEqual(results[self.newcomer.pk], [
+            (self.second.pk, 2), (self.third.pk, 1),
+        ])
+        self.assertEqual(results[self.reader.pk], [(self.third.pk, 2)])
+        self.assertEqual(results[self.fan.pk], [])
+
+    def test_rebuild_replaces_stored_rows(self):
+        self.rebuild()
+        self.assertEqual(Recommendation.objects.count(), 3)
+        Follow.objects.filter(user=self.newcomer).delete()
+        self.rebuild()
+        self.assertFalse(
+            Recommendation.objects.filter(user=self.newcomer).exists()
+        )
+
+    def test_follow_index_shows_suggestions(self):
+        self.rebuild()
+        following_ids(self.newcomer.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                recommended_authors(self.newcomer),
+                [self.second, self.third],
+            )
+        response = self.client.get(INDEX_FOLLOW)
+        self.assertEqual(
+            response.context['recommended'], [self.second, self.third]
+        )
+        self.client.get(
+            reverse('posts:profile_follow', args=[self.second.username])
+        )
+        # TestCase never commits, so run the commit hook by hand.
+        forget_follow(self.newcomer.pk, self.second.pk)
+        response = self.client.get(INDEX_FOLLOW)
+        self.assertEqual(response.context['recommended'], [self.third])
+
+    def test_own_profile_shows_suggestions(self):
+        self.rebuild()
+        own = self.client.get(
+            reverse('posts:profile', args=[self.newcomer.username])
+        )
+        self.assertEqual(own.context['recommended'], [self.second, self.third])
+        other = self.client.get(
+            reverse('posts:profile', args=[self.first.username])
+        )
+        self.assertNotIn('recommended', other.context)
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_schedule_queues_periodic_refresh(self):
+        call_command('recommend_authors', '--schedule', stdout=StringIO())
+        call_command('recommend_authors', '--schedule', stdout=StringIO())
+        self.assertEqual(Job.objects.count(), 1)
+        call_command(
+            'runworker', '--once', '--workers=0', stdout=StringIO()
+        )
+        self.assertEqual(Recommendation.objects.count(), 3)
+        job = Job.objects.get()
+        self.assertEqual(job.task, 'posts.recommendations.'
+                         'refresh_recommendations')
+        self.assertEqual(job.status, Job.QUEUED)
@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Comment, Post, User
+from ..search import get_backend
+
+SEARCH = reverse('posts:search')
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user('auth')
+        cls.post_cats = Post.objects.create(
+            author=cls.user,
+            text='Коты коты и ещё раз коты',
+        )
+        cls.post_dogs = Post.objects.create(
+            author=cls.user,
+            text='Собаки лучше всех',
+        )
+        Comment.objects.create(
+            author=cls.user,
+            post=cls.post_dogs,
+            text='А мне нравятся коты',
+        )
+
+    def search(self, query, **params):
+        response = self.client.get(SEARCH, {'q': query, **params})
+        return response.context['page_obj']
+
+    def test_search_ranks_posts_and_comments(self):
+        page_obj = self.search('коты')
+        self.assertEqual(
+            page_obj.object_list, [self.post_cats, self.post_dogs]
+        )
+
+    def test_search_prefix_and_case(self):
+        self.assertEqual(self.search('СОБАК').object_list, [self.post_dogs])
+
+    def test_search_follows_deletes(self):
+        Post.objects.filter(pk=self.post_cats.pk).delete()
+        self.assertEqual(self.search('коты').object_list, [self.post_dogs])
+
+    def test_search_keyset_pagination(self):
+        Post.objects.bulk_create([
+            Post(author=self.user, text=f'Попугай номер {i}')
+            for i in range(12)
+        ])
+        call_command('rebuild_search_index', stdout=StringIO())
+        first_page = self.search('попугай')
+        self.assertEqual(len(first_page), 10)
+        second_page = self.search('попугай', cursor=first_page.next_cursor)
+        self.assertEqual(len(second_page), 2)
+        self.assertEqual(second_page.number, 2)
+        self.assertFalse(
+            set(first_page.object_list) & set(second_page.object_list)
+        )
+
+    def test_empty_query(self):
+        self.assertEqual(len(self.search('')), 0)
+
+    def test_query_without_words(self):
+        for query in ('!!!', '"', '-', '*'):
+            with self.subTest(query=query):
+                self.assertEqual(len(self.search(query)), 0)
+                self.assertEqual(get_backend().matching_ids(Post, query), [])
+
+    def test_admin_search_uses_index(self):
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        client = Client()
+        client.force_login(admin)
+        response = client.get(
+            reverse('admin:posts_comment_changelist'), {'q': 'коты'}
+        )
+        self.assertEqual(response.context['cl'].result_count, 1)
+        self.assertEqual(
+            get_backend().matching_ids(Post, 'собаки'), [self.post_dogs.pk]
+        )
+
+    def test_sqlite_uses_fts5(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('FTS5 есть только в SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'posts_search'"
+            )
+            self.assertIn('fts5', cursor.fetchone()[0])
@@ -0,0 +1,91 @@
+import os
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from ..models import Comment, Follow, Group, Post, User, UserCounters
+from ..search import search_posts
+from ..sitedata import SiteDataError, export_site, import_site
+
+OLD_DATE = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+class SiteDataTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user('auth')
+        self.reader = User.objects.create_user('reader')
+        self.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        self.post = Post.objects.create(
+            author=self.author, group=self.group, text='Тестовый пост'
+        )
+        Post.objects.filter(pk=self.post.pk).update(pub_date=OLD_DATE)
+        Comment.objects.create(
+            post=self.post, author=self.reader, text='Комментарий'
+        )
+        Follow.objects.create(user=self.reader, author=self.author)
+
+    def wipe(self):
+        User.objects.all().delete()
+        Group.objects.all().delete()
+
+    def test_round_trip_restores_rows_and_derived_data(self):
+        dump = StringIO()
+        totals = export_site(dump)
+        self.assertEqual(totals['posts.post'], 1)
+        self.wipe()
+        dump.seek(0)
+        totals = import_site(dump, batch_size=1)
+        self.assertEqual(totals['auth.user'], 2)
+        post = Post.objects.get()
+        self.assertEqual(post.pk, self.post.pk)
+        self.assertEqual(post.pub_date, OLD_DATE)
+        self.assertEqual(post.group.slug, 'group')
+        self.assertEqual(Comment.objects.get().author.username, 'reader')
+        self.assertTrue(Follow.objects.filter(
+            user__username='reader', author__username='auth'
+        ).exists())
+        counters = UserCounters.objects.get(user__username='auth')
+        self.assertEqual(counters.post_count, 1)
+        self.assertEqual(counters.follower_count, 1)
+        self.assertEqual(list(search_posts('тестовый', None, 10)), [post])
+
+    def test_commands_use_gzip_by_extension(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'site.ndjson.gz')
+            call_command('export_site', path, stdout=StringIO())
+            with open(path, 'rb') as dump:
+                self.assertEqual(dump.read(2), b'\x1f\x8b')
+            self.wipe()
+            call_command('import_site', path, stdout=StringIO())
+        self.assertEqual(Post.objects.count(), 1)
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_import_rejects_unknown_model(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'site.ndjson')
+            with open(path, 'w', encoding='utf-8') as dump:
+                dump.write('{"model": "auth.permission", "fields": {}}\n')
+            with self.assertRaisesMessage(CommandError, 'auth.permission'):
+                call_command('import_site', path, stdout=StringIO())
+
+    def test_import_rejects_unknown_fields(self):
+        dump = StringIO(
+            '{"model": "posts.group", "fields": {"slug": "x", "colour": 1}}\n'
+        )
+        with self.assertRaisesMessage(SiteDataError, 'colour'):
+            import_site(dump)
+        self.assertEqual(Group.objects.count(), 1)
+
+    def test_import_into_filled_database_fails_cleanly(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'site.ndjson')
+            call_command('export_site', path, stdout=StringIO())
+            with self.assertRaisesMessage(CommandError, 'auth.user'):
+                call_command('import_site', path, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 2)
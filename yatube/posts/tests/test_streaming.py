@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Follow, Group, Post, User
+from yatube.settings import QUANTITY
+
+USER_NAME = 'auth'
+USER_NAME_2 = 'man'
+SLUG = 'test_slug'
+
+
+@mock.patch('posts.views.STREAM_FEEDS', True)
+class StreamingFeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(USER_NAME)
+        cls.reader = User.objects.create_user(USER_NAME_2)
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug=SLUG, description='Описание'
+        )
+        for number in range(3):
+            Post.objects.create(
+                author=cls.author, group=cls.group, text=f'Пост {number}'
+            )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_feeds_stream_cards_after_head(self):
+        for address in (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[SLUG]),
+            reverse('posts:profile', args=[USER_NAME]),
+            reverse('posts:follow_index'),
+        ):
+            with self.subTest(address=address):
+                response = self.reader_client.get(address)
+                self.assertTrue(response.streaming)
+                chunks = [
+                    chunk.decode() for chunk in response.streaming_content
+                ]
+                self.assertIn('<nav', chunks[0])
+                self.assertNotIn('Пост', chunks[0])
+                self.assertIn('Пост 2', chunks[1])
+                page = ''.join(chunks)
+                self.assertEqual(page.count('<hr>'), 2)
+                self.assertTrue(page.rstrip().endswith('</html>'))
+                self.assertNotIn('stream-items', page)
+
+    def test_head_is_sent_before_page_query(self):
+        response = self.reader_client.get(reverse('posts:index'))
+        chunks = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as queries:
+            next(chunks)
+        self.assertFalse([
+            query for query in queries
+            if 'posts_post' in query['sql']
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIn('Пост 2', next(chunks).decode())
+        self.assertTrue([
+            query for query in queries
+            if 'posts_post' in query['sql']
+        ])
+
+    def test_paginator_follows_streamed_cards(self):
+        Post.objects.bulk_create(
+            Post(author=self.author, text=f'Ещё пост {number}')
+            for number in range(QUANTITY)
+        )
+        response = self.reader_client.get(reverse('posts:index'))
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 2 * QUANTITY + 1)
+        self.assertIn('?cursor=', chunks[-1])
+        self.assertNotIn('?cursor=', ''.join(chunks[:-1]))
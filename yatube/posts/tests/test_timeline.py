@@ -0,0 +1,116 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+
+from core import jobs
+from core.models import Job
+from django.urls import reverse
+
+from ..models import Follow, Post, TimelineEntry, User, UserCounters
+from ..timeline import celebrity_authors
+
+INDEX_FOLLOW = reverse('posts:follow_index')
+API_FOLLOW = reverse('api:follow_index')
+USER_NAME = 'auth'
+USER_NAME_2 = 'man'
+
+
+@override_settings(TIMELINE_ENABLED=True, JOBS_RUN_INLINE=True)
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(USER_NAME)
+        cls.follower = User.objects.create_user(USER_NAME_2)
+        cls.old_post = Post.objects.create(
+            author=cls.author,
+            text='Старая запись',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.follower_client = Client()
+        self.follower_client.force_login(self.follower)
+
+    def follow(self):
+        self.follower_client.get(
+            reverse('posts:profile_follow', args=[USER_NAME])
+        )
+
+    def test_follow_backfills_timeline(self):
+        self.follow()
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.follower, post=self.old_post).exists())
+
+    def test_new_post_fans_out(self):
+        self.follow()
+        post = Post.objects.create(author=self.author, text='Новая запись')
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.follower, post=post).exists())
+        response = self.follower_client.get(INDEX_FOLLOW)
+        self.assertIn(post, response.context['page_obj'].object_list)
+
+    def test_unfollow_prunes_timeline(self):
+        self.follow()
+        self.follower_client.get(
+            reverse('posts:profile_unfollow', args=[USER_NAME])
+        )
+        self.assertFalse(
+            TimelineEntry.objects.filter(user=self.follower).exists()
+        )
+        response = self.follower_client.get(INDEX_FOLLOW)
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    @override_settings(TIMELINE_MAX_LENGTH=2)
+    def test_timeline_is_bounded(self):
+        self.follow()
+        for i in range(3):
+            Post.objects.create(author=self.author, text=f'Запись {i}')
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.follower).count(), 2
+        )
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=0)
+    def test_celebrity_posts_read_on_demand(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        post = Post.objects.create(author=self.author, text='Новая запись')
+        self.assertFalse(TimelineEntry.objects.exists())
+        response = self.follower_client.get(INDEX_FOLLOW)
+        self.assertIn(post, response.context['page_obj'].object_list)
+        self.assertIn(self.old_post, response.context['page_obj'].object_list)
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=1)
+    def test_celebrities_come_from_stored_counters(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        self.assertNotIn('COUNT', str(celebrity_authors(self.follower).query))
+        self.assertFalse(celebrity_authors(self.follower).exists())
+        UserCounters.objects.filter(user=self.author).update(
+            follower_count=2
+        )
+        self.assertTrue(celebrity_authors(self.follower).exists())
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=1)
+    def test_posts_stay_after_author_leaves_celebrities(self):
+        other = User.objects.create_user('other')
+        Follow.objects.create(user=self.follower, author=self.author)
+        Follow.objects.create(user=other, author=self.author)
+        post = Post.objects.create(author=self.author, text='Новая запись')
+        response = self.follower_client.get(INDEX_FOLLOW)
+        self.assertIn(post, response.context['page_obj'].object_list)
+        Follow.objects.filter(user=other).delete()
+        self.assertTrue(TimelineEntry.objects.filter(
+            user=self.follower, post=post).exists())
+        response = self.follower_client.get(INDEX_FOLLOW)
+        self.assertIn(post, response.context['page_obj'].object_list)
+
+    @override_settings(JOBS_RUN_INLINE=False)
+    def test_fan_out_revalidates_follow_feed(self):
+        Follow.objects.create(user=self.follower, author=self.author)
+        post = Post.objects.create(author=self.author, text='Новая запись')
+        etag = self.follower_client.get(API_FOLLOW)['ETag']
+        for job in Job.objects.all():
+            jobs.run(job.pk)
+        response = self.follower_client.get(
+            API_FOLLOW, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['id'], post.pk)
@@ -142,6 +142,30 @@ class PostPagesTests(TestCase):
         response = self.client.get(INDEX + '?page=2')
         self.assertEqual(len(response.context['page_obj']), 4)
 
+    def test_paginator_index_cursor(self):
+        first_page = self.client.get(INDEX).context['page_obj']
+        self.assertIsNone(first_page.previous_cursor)
+        second_page = self.client.get(
+            INDEX, {'cursor': first_page.next_cursor}
+        ).context['page_obj']
+        self.assertEqual(len(second_page), 4)
+        self.assertEqual(second_page.number, 2)
+        self.assertIsNone(second_page.next_cursor)
+        self.assertFalse(
+            set(first_page.object_list) & set(second_page.object_list)
+        )
+        back_page = self.client.get(
+            INDEX, {'cursor': second_page.previous_cursor}
+        ).context['page_obj']
+        self.assertEqual(back_page.object_list, first_page.object_list)
+        self.assertEqual(back_page.number, 1)
+
+    def test_paginator_invalid_cursor(self):
+        response = self.client.get(INDEX, {'cursor': 'broken'})
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.number, 1)
+        self.assertEqual(len(page_obj), QUANTITY)
+
     def test_group_list_page_show_correct_context(self):
         response = self.authorized_client.get(GROUP)
         first_object = response.context["page_obj"][0]
@@ -240,20 +264,79 @@ class PostPagesTests(TestCase):
         self.assertEqual(comment.text, 'Первый на!')
 
     def test_cache(self):
+        response = self.authorized_client.get(INDEX)
+        cache_1 = response.content
+        Post.objects.update(text='Без сигнала')
+        response = self.authorized_client.get(INDEX)
+        self.assertEqual(cache_1, response.content)
         post = Post.objects.create(
             author=self.user,
             text='Проверка кэша',
         )
         response = self.authorized_client.get(INDEX)
-        cache_1 = response.content
+        self.assertContains(response, post.text)
         post.delete()
         response = self.authorized_client.get(INDEX)
-        cache_2 = response.content
-        response = self.authorized_client.get(INDEX)
-        self.assertEqual(cache_1, cache_2)
-        cache.clear()
-        cache_3 = self.authorized_client.get(INDEX)
-        self.assertNotEqual(cache_3, response.content)
+        self.assertNotContains(response, post.text)
+
+    def test_cache_group_and_profile_invalidation(self):
+        for address in (GROUP, PROFILE):
+            with self.subTest(address=address):
+                self.authorized_client.get(address)
+                post = Post.objects.create(
+                    author=self.user,
+                    group=self.group,
+                    text='Проверка кэша',
+                )
+                response = self.authorized_client.get(address)
+                self.assertContains(response, post.text)
+                post.delete()
+
+    def test_cached_page_not_shared_between_users(self):
+        self.another_client.get(PROFILE)
+        response = self.follower_client.get(PROFILE)
+        self.assertContains(response, f'Пользователь: {USER_NAME_2}')
+        self.assertNotContains(response, f'Пользователь: {USER_NAME_3}')
+        self.assertContains(response, 'Отписаться')
+        response = self.client.get(PROFILE)
+        self.assertNotContains(response, 'Пользователь:')
+
+    def test_follow_refreshes_follower_profile(self):
+        follower_profile = reverse('posts:profile', args=[USER_NAME_3])
+        response = self.client.get(follower_profile)
+        self.assertContains(response, 'подписок: 0')
+        etag = response['ETag']
+        self.another_client.get(self.FOLLOW_PAGE)
+        response = self.client.get(
+            follower_profile, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'подписок: 1')
+
+    def test_conditional_get(self):
+        for address in (INDEX, GROUP, PROFILE, self.POST_DETAIL):
+            with self.subTest(address=address):
+                response = self.client.get(address)
+                self.assertTrue(response.has_header('Last-Modified'))
+                etag = response['ETag']
+                with self.assertNumQueries(0):
+                    response = self.client.get(
+                        address, HTTP_IF_NONE_MATCH=etag
+                    )
+                self.assertEqual(response.status_code, 304)
+                post = Post.objects.create(
+                    author=self.user,
+                    group=self.group,
+                    text='Проверка ETag',
+                )
+                response = self.client.get(address, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                post.delete()
+
+    def test_conditional_get_varies_by_user(self):
+        etag = self.authorized_client.get(INDEX)['ETag']
+        response = self.follower_client.get(INDEX, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
 
     def test_follow(self):
         self.follower_client.get(self.FOLLOW_PAGE)
@@ -0,0 +1,48 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from sorl.thumbnail import get_thumbnail
+
+from core.jobs import enqueue, task
+
+logger = logging.getLogger(__name__)
+
+# Must match the {% thumbnail %} tags in the feed templates, otherwise the
+# pre-generated thumbnail is stored under a different key.
+FEED_GEOMETRY = "960x339"
+FEED_OPTIONS = {"crop": "center", "upscale": True}
+
+
+@task
+def generate(name):
+    get_thumbnail(name, FEED_GEOMETRY, **FEED_OPTIONS)
+
+
+def generate_logged(name):
+    try:
+        generate(name)
+        return True
+    except Exception:
+        logger.exception("Не удалось создать миниатюру для %s", name)
+        return False
+
+
+def generate_in_worker(name):
+    try:
+        return generate_logged(name)
+    finally:
+        connection.close()
+
+
+def schedule(post):
+    # Normalized uploads carry their own feed variants.
+    if post.image and not post.image_jpeg:
+        enqueue(generate, post.image.name)
+
+
+def generate_all(names, workers):
+    if workers < 1:
+        return sum(map(generate_logged, names))
+    with ThreadPoolExecutor(workers, thread_name_prefix="thumbnails") as pool:
+        return sum(pool.map(generate_in_worker, names))
@@ -0,0 +1,131 @@
+from django.conf import settings
+from django.db.models import Count, Q
+
+from core.cache import bump_generations
+from core.jobs import task
+
+from .models import Follow, Post, TimelineEntry, User, UserCounters
+
+
+def timeline_enabled():
+    return settings.TIMELINE_ENABLED
+
+
+def is_celebrity(author):
+    return UserCounters.objects.filter(
+        user=author, follower_count__gt=settings.TIMELINE_FANOUT_LIMIT
+    ).exists()
+
+
+def left_celebrities(author):
+    """Whether the last unfollow took ``author`` down to the fan-out limit."""
+    return UserCounters.objects.filter(
+        user=author, follower_count=settings.TIMELINE_FANOUT_LIMIT
+    ).exists()
+
+
+def follower_ids(author):
+    """Followers to fan out to, or ``None`` for authors read on demand."""
+    if is_celebrity(author):
+        return None
+    return list(
+        Follow.objects.filter(author=author).values_list("user_id", flat=True)
+    )
+
+
+def celebrity_authors(user):
+    # Decided by the stored counter, as in ``follower_ids``, so a post is
+    # either fanned out or read on demand.
+    return Follow.objects.filter(
+        user=user,
+        author__counters__follower_count__gt=settings.TIMELINE_FANOUT_LIMIT,
+    ).values("author")
+
+
+def trim(users):
+    max_length = settings.TIMELINE_MAX_LENGTH
+    overflowing = TimelineEntry.objects.filter(user__in=users).values(
+        "user"
+    ).annotate(total=Count("pk")).filter(total__gt=max_length)
+    for row in overflowing:
+        keep = TimelineEntry.objects.filter(user=row["user"]).order_by(
+            "-pub_date", "-post_id"
+        ).values_list("pk", flat=True)[:max_length]
+        TimelineEntry.objects.filter(user=row["user"]).exclude(
+            pk__in=list(keep)
+        ).delete()
+
+
+def fan_out(post):
+    followers = follower_ids(post.author_id)
+    if not followers:
+        return
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=user, post=post, pub_date=post.pub_date)
+            for user in followers
+        ],
+        ignore_conflicts=True,
+    )
+    trim(followers)
+    # Feeds validated before the worker got here must not stay fresh.
+    bump_generations(("follows", user) for user in followers)
+
+
+@task
+def fan_out_post(post_id):
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None:
+        fan_out(post)
+
+
+def backfill(user, author):
+    if follower_ids(author) is None:
+        return
+    posts = Post.objects.filter(author=author).order_by(
+        "-pub_date", "-pk"
+    ).values_list("pk", "pub_date")[:settings.TIMELINE_MAX_LENGTH]
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user=user, post_id=post, pub_date=pub_date)
+            for post, pub_date in posts
+        ],
+        ignore_conflicts=True,
+    )
+    trim([user])
+
+
+@task
+def backfill_followers(author_id):
+    """Materialize the author's posts for every follower.
+
+    Posts published while the author was over ``TIMELINE_FANOUT_LIMIT``
+    were read on demand and never fanned out; once the author drops back
+    under the limit they must come from ``TimelineEntry``.
+    """
+    followers = list(User.objects.filter(follower__author=author_id))
+    for user in followers:
+        backfill(user, author_id)
+    bump_generations(("follows", user.pk) for user in followers)
+
+
+def prune(user, author):
+    TimelineEntry.objects.filter(user=user, post__author=author).delete()
+
+
+def rebuild(user):
+    TimelineEntry.objects.filter(user=user).delete()
+    authors = Follow.objects.filter(user=user).values_list(
+        "author", flat=True
+    )
+    for author in authors:
+        backfill(user, author)
+
+
+def timeline_posts(user):
+    if not timeline_enabled():
+        return Post.objects.filter(author__following__user=user)
+    materialized = TimelineEntry.objects.filter(user=user).values("post")
+    return Post.objects.filter(
+        Q(pk__in=materialized) | Q(author__in=celebrity_authors(user))
+    )
@@ -1,90 +1,266 @@
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.core.cache import cache
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.cache import cache_page
+from django.urls import reverse
 
+from core import uploads
+from core.cache import (
+    cache_page_versioned, condition_versioned, get_generations
+)
+from core.db import serialized_write
+from core.pagination import KeysetPaginator
+from core.routers import replica_reads
+from core.streaming import stream_template
+
+from . import thumbnails
+from .counters import counters_for
+from .follow_graph import is_following
 from .forms import CommentForm, PostForm
-from .models import Follow, Group, Post, User
+from .models import Comment, Follow, Group, Post, User
+from .recommendations import recommended_authors
+from .search import search_posts
+from .timeline import timeline_posts
+
+from yatube.settings import (
+    COMMENTS_QUANTITY, PAGE_CACHE_TIMEOUT, QUANTITY, STREAM_FEEDS
+)
+
+
+def card_scopes(post):
+    return [("post", post.pk), ("author", post.author_id), ("groups",)]
+
+
+def attach_card_versions(posts):
+    """Set ``post.card_version`` for the cached post card fragments.
+
+    All generations for the page are read with a single ``get_many``.
+    """
+    scopes = list(dict.fromkeys(
+        scope for post in posts for scope in card_scopes(post)
+    ))
+    tokens = dict(zip(scopes, get_generations(*scopes)))
+    for post in posts:
+        post.card_version = ":".join(
+            tokens[scope] for scope in card_scopes(post)
+        )
+    return posts
+
+
+def get_page(request, posts):
+    paginator = KeysetPaginator(posts, QUANTITY, approximate_total=True)
+    page_obj = paginator.get_page(
+        request.GET.get("page"), request.GET.get("cursor")
+    )
+    page_obj.object_list = attach_card_versions(list(page_obj.object_list))
+    return page_obj
 
-from yatube.settings import QUANTITY
+
+def render_feed(request, template, context, posts):
+    """Render a feed page of ``posts``; streamed with ``STREAM_FEEDS``.
+
+    When streaming, the page query runs only after the head of the page
+    has been sent.
+    """
+    if not STREAM_FEEDS:
+        context["page_obj"] = get_page(request, posts)
+        return render(request, template, context)
+    return stream_template(
+        request,
+        template,
+        context,
+        # The generator runs after the view returns, outside its routing.
+        lambda: replica_reads(get_page)(request, posts),
+        "posts/includes/post_card.html",
+        "post",
+        separator="<hr>",
+    )
 
 
-@cache_page(20, key_prefix="index_page")
+@condition_versioned(lambda request: [("groups",), ("posts",)])
+@cache_page_versioned(
+    PAGE_CACHE_TIMEOUT,
+    lambda request: [("groups",), ("posts",)]
+)
+@replica_reads
 def index(request):
     template = "posts/index.html"
     title = "Последние обновления на сайте"
-    posts = Post.objects.all()
-    paginator = Paginator(posts, QUANTITY)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    posts = Post.objects.for_feed()
     context = {
-        "page_obj": page_obj,
         "title": title,
     }
-    return render(request, template, context)
+    return render_feed(request, template, context, posts)
 
 
+@condition_versioned(
+    lambda request, any_slug: [("groups",), ("group", any_slug)]
+)
+@cache_page_versioned(
+    PAGE_CACHE_TIMEOUT,
+    lambda request, any_slug: [("groups",), ("group", any_slug)]
+)
+@replica_reads
 def group_posts(request, any_slug):
     template = "posts/group_list.html"
     group = get_object_or_404(Group, slug=any_slug)
     title = group
-    posts = group.groups_name.all()
-    paginator = Paginator(posts, QUANTITY)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    posts = group.groups_name.for_feed()
     context = {
         "group": group,
-        "page_obj": page_obj,
         "title": title,
     }
-    return render(request, template, context)
+    return render_feed(request, template, context, posts)
 
 
+def profile_scopes(request, username):
+    scopes = [("groups",), ("profile", username)]
+    if request.user.get_username() == username:
+        # Owners see suggestions, which drop authors once followed.
+        scopes += [("recommendations",), ("follows", request.user.pk)]
+    return scopes
+
+
+@condition_versioned(profile_scopes)
+@cache_page_versioned(PAGE_CACHE_TIMEOUT, profile_scopes)
+@replica_reads
 def profile(request, username):
     template = "posts/profile.html"
-    user = get_object_or_404(User, username=username)
+    user = get_object_or_404(
+        User.objects.select_related("counters"), username=username
+    )
+    counters_for(user)
     title = f"Профайл пользователя {username}"
-    posts = Post.objects.filter(author=user)
-    paginator = Paginator(posts, QUANTITY)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
-    following = request.user.is_authenticated and Follow.objects.filter(
-        user=request.user,
-        author=user
-    ).exists()
+    posts = Post.objects.filter(author=user).for_feed()
+    following = is_following(request.user.pk, user.pk)
     context = {
         "author": user,
-        "page_obj": page_obj,
         "title": title,
         "following": following,
     }
-    return render(request, template, context)
+    if request.user == user:
+        context["recommended"] = recommended_authors(user)
+    return render_feed(request, template, context, posts)
+
 
+def detail_scopes(request, post_id):
+    # A post never changes author, so the lookup is cached indefinitely.
+    key = f"post_author:{post_id}"
+    author_id = cache.get(key)
+    if author_id is None:
+        author_id = Post.objects.filter(pk=post_id).values_list(
+            "author_id", flat=True
+        ).first()
+        if author_id is not None:
+            cache.set(key, author_id, None)
+    return [("groups",), ("post", post_id), ("author", author_id)]
 
+
+@condition_versioned(detail_scopes)
+@replica_reads
 def post_detail(request, post_id):
     template = "posts/post_detail.html"
-    post_item = get_object_or_404(Post, pk=post_id)
+    post_item = get_object_or_404(
+        Post.objects.for_feed().select_related("author__counters"),
+        pk=post_id
+    )
+    counters_for(post_item.author)
+    attach_card_versions([post_item])
     title = f"Пост { post_item.text[0:30] }"
     form = CommentForm(request.POST or None)
-    comment = post_item.comments.all()
     context = {
         "post_item": post_item,
         "title": title,
         "form": form,
-        "comments": comment
+        "comments": get_comments_page(post_item.pk),
     }
     return render(request, template, context)
 
 
+def get_comments_page(post_id, cursor=None):
+    comments = Comment.objects.filter(post_id=post_id).select_related(
+        "author"
+    )
+    return KeysetPaginator(comments, COMMENTS_QUANTITY).get_page(
+        cursor=cursor
+    )
+
+
+@condition_versioned(lambda request, post_id: [("post", post_id)])
+@replica_reads
+def post_comments(request, post_id):
+    post_item = get_object_or_404(Post.objects.only("pk"), pk=post_id)
+    comments = get_comments_page(post_item.pk, request.GET.get("cursor"))
+    if request.GET.get("format") != "json":
+        return render(request, "posts/includes/comments.html", {
+            "comments": comments,
+            "post_id": post_item.pk,
+        })
+    next_url = None
+    if comments.next_cursor:
+        next_url = reverse("posts:post_comments", args=[post_item.pk])
+        next_url += f"?format=json&cursor={comments.next_cursor}"
+    return JsonResponse({
+        "results": [
+            {
+                "id": comment.pk,
+                "text": comment.text,
+                "pub_date": comment.pub_date.isoformat(),
+                "author": comment.author.username,
+            }
+            for comment in comments
+        ],
+        "next": next_url,
+    }, json_dumps_params={"ensure_ascii": False})
+
+
+def post_files(request):
+    """``request.FILES`` plus a finished chunked upload as ``image``."""
+    upload_id = request.POST.get("upload")
+    if not upload_id:
+        return request.FILES or None
+    files = request.FILES.copy()
+    files["image"] = uploads.finished_file(request.user, upload_id)
+    return files
+
+
+def uploaded_image(files):
+    image = files and files.get("image")
+    if getattr(image, "upload", None) is not None:
+        return image
+    return None
+
+
+def close_upload(files):
+    """Close the upload opened by ``post_files``, whatever the outcome."""
+    image = uploaded_image(files)
+    if image is not None:
+        image.close()
+
+
+def discard_upload(files):
+    image = uploaded_image(files)
+    if image is not None:
+        image.close()
+        uploads.discard(image.upload)
+
+
 @login_required
 def post_create(request):
     template = "posts/create.html"
-    form = PostForm(request.POST or None, files=request.FILES or None)
-    if form.is_valid():
-        post = form.save(commit=False)
-        post.author = request.user
-        post.save()
-        return redirect("posts:profile", request.user.username)
+    files = post_files(request)
+    try:
+        form = PostForm(request.POST or None, files=files)
+        if form.is_valid():
+            post = form.save(commit=False)
+            post.author = request.user
+            with serialized_write():
+                post.save()
+                thumbnails.schedule(post)
+            discard_upload(files)
+            return redirect("posts:profile", request.user.username)
+    finally:
+        close_upload(files)
     template = "posts/create.html"
     form = PostForm()
     context = {
@@ -96,14 +272,26 @@ def post_create(request):
 @login_required
 def post_edit(request, post_id):
     post_item = get_object_or_404(Post, pk=post_id, author=request.user)
-    form = PostForm(
-        request.POST or None,
-        files=request.FILES or None,
-        instance=post_item
-    )
-    if form.is_valid():
-        form.save()
-        return redirect("posts:post_detail", post_item.id)
+    files = post_files(request)
+    try:
+        form = PostForm(
+            request.POST or None,
+            files=files,
+            instance=post_item
+        )
+        if form.is_valid():
+            with serialized_write():
+                # Saving only the edited fields keeps concurrent
+                # comment_count increments intact.
+                form.save(commit=False).save(
+                    update_fields=form.changed_fields
+                )
+                if "image" in form.changed_data:
+                    thumbnails.schedule(post_item)
+            discard_upload(files)
+            return redirect("posts:post_detail", post_item.id)
+    finally:
+        close_upload(files)
     form = PostForm(instance=post_item)
     template = "posts/create.html"
     context = {
@@ -122,21 +310,20 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        with serialized_write():
+            comment.save()
     return redirect("posts:post_detail", post_id=post_id)
 
 
 @login_required
+@replica_reads
 def follow_index(request):
     template = "posts/follow.html"
-    posts = Post.objects.filter(author__following__user=request.user)
-    paginator = Paginator(posts, QUANTITY)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    posts = timeline_posts(request.user).for_feed()
     context = {
-        "page_obj": page_obj,
+        "recommended": recommended_authors(request.user),
     }
-    return render(request, template, context)
+    return render_feed(request, template, context, posts)
 
 
 @login_required
@@ -144,10 +331,11 @@ def profile_follow(request, username):
     user = request.user
     author = get_object_or_404(User, username=username)
     if user != author:
-        Follow.objects.get_or_create(
-            user=user,
-            author=author
-        )
+        with serialized_write():
+            Follow.objects.get_or_create(
+                user=user,
+                author=author
+            )
         return redirect("posts:follow_index")
     return redirect("posts:profile", username=username)
 
@@ -155,7 +343,20 @@ def profile_follow(request, username):
 @login_required
 def profile_unfollow(request, username):
     unfollow = get_object_or_404(User, username=username)
-    follow = request.user.follower.filter(author=unfollow)
-    if follow.exists():
-        follow.delete()
+    with serialized_write():
+        request.user.follower.filter(author=unfollow).delete()
     return redirect("posts:profile", username)
+
+
+@replica_reads
+def search(request):
+    template = "posts/search.html"
+    query = request.GET.get("q", "").strip()
+    page_obj = search_posts(query, request.GET.get("cursor"), QUANTITY)
+    attach_card_versions(page_obj.object_list)
+    context = {
+        "page_obj": page_obj,
+        "query": query,
+        "title": f"Поиск: {query}" if query else "Поиск",
+    }
+    return render(request, template, context)
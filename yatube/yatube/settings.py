@@ -27,11 +27,15 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'core.apps.CoreConfig',
     'about.apps.AboutConfig',
+    'api.apps.ApiConfig',
+    'benchmarks.apps.BenchmarksConfig',
     'sorl.thumbnail',
     'debug_toolbar',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -45,12 +49,24 @@ MIDDLEWARE = [
 ROOT_URLCONF = 'yatube.urls'
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# Compiled templates stay in memory and are warmed by wsgi.py at startup.
+TEMPLATE_PRODUCTION = os.getenv(
+    'TEMPLATE_PRODUCTION', default='' if DEBUG else '1'
+) == '1'
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if TEMPLATE_PRODUCTION else TEMPLATE_LOADERS
+            ),
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -61,6 +77,9 @@ TEMPLATES = [
     },
 ]
 
+# The toolbar only checks APP_DIRS; explicit loaders cover app templates.
+SILENCED_SYSTEM_CHECKS = ['debug_toolbar.W006']
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
 
@@ -68,8 +87,39 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'OPTIONS': {
+            'timeout': 20,
+        },
+    }
+}
+
+# Read replicas: comma-separated paths to copies of the primary database.
+DATABASE_REPLICAS = []
+for number, path in enumerate(
+    filter(None, os.getenv('DATABASE_REPLICAS', default='').split(',')), 1
+):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'NAME': path.strip(),
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_PIN_COOKIE = 'primary_pin'
+REPLICA_PIN_SECONDS = 10
+
+SQLITE_PRODUCTION = os.getenv('SQLITE_PRODUCTION', default='') == '1'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 20 * 1000,
+    'temp_store': 'MEMORY',
 }
+SQLITE_WRITE_LOCK = os.getenv('SQLITE_WRITE_LOCK')
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -89,10 +139,34 @@ AUTH_PASSWORD_VALIDATORS = [
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'core.cache_backend.SQLiteCache',
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION', default=os.path.join(BASE_DIR, 'cache.sqlite3')
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+            'MAX_SIZE': 256 * 1024 * 1024,
+        },
     }
 }
 
+THUMBNAIL_CACHE = 'default'
+
+# Tests get temporary cache and metrics files; see conftest.py for pytest.
+TEST_RUNNER = 'core.testing.TemporaryFilesRunner'
+
+# Uploaded images are shrunk to fit this square and re-encoded.
+IMAGE_MAX_SIZE = 2048
+IMAGE_QUALITY = 82
+
+# Chunked uploads are assembled here before they reach MEDIA_ROOT.
+UPLOAD_TEMP_DIR = os.getenv(
+    'UPLOAD_TEMP_DIR', default=os.path.join(BASE_DIR, 'uploads')
+)
+UPLOAD_MAX_SIZE = 50 * 1024 * 1024
+UPLOAD_CHUNK_MAX_SIZE = 8 * 1024 * 1024
+UPLOAD_EXPIRY = 60 * 60 * 24
+
 
 LANGUAGE_CODE = 'ru'
 
@@ -118,5 +192,38 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 QUANTITY = 10
+COMMENTS_QUANTITY = 20
+
+PAGE_CACHE_TIMEOUT = 60 * 60 * 24
+CARD_CACHE_TIMEOUT = 60 * 60 * 24
+# Follow sets are dropped when a follow commits; the timeout bounds any drift.
+FOLLOW_GRAPH_TIMEOUT = 60 * 60 * 24
+# Stream feed pages card by card; such responses bypass the page cache.
+STREAM_FEEDS = os.getenv('STREAM_FEEDS', default='') == '1'
+
+METRICS_LOCATION = os.getenv(
+    'METRICS_LOCATION', default=os.path.join(BASE_DIR, 'metrics.sqlite3')
+)
+METRICS_ALLOWED_IPS = INTERNAL_IPS
+METRICS_SLOW_REQUEST = 0.5
+METRICS_KEEP_QUERIES = 200
+
+JOBS_RUN_INLINE = os.getenv('JOBS_RUN_INLINE', default='') == '1'
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_DELAY = 10
+JOBS_VISIBILITY_TIMEOUT = 5 * 60
+
+APPROXIMATE_COUNT_TIMEOUT = 60
+
+TIMELINE_ENABLED = os.getenv('TIMELINE_ENABLED', default='') == '1'
+TIMELINE_MAX_LENGTH = 500
+TIMELINE_FANOUT_LIMIT = 1000
+
+RECOMMENDATIONS_PER_USER = 20
+RECOMMENDATIONS_SHOWN = 5
+# Co-followed authors kept per author between the two passes.
+RECOMMENDATIONS_NEIGHBOURS = 50
+RECOMMENDATIONS_MAX_FOLLOWING = 1000
+RECOMMENDATIONS_INTERVAL = 6 * 60 * 60
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'